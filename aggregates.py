@@ -0,0 +1,289 @@
+"""Aggregates that can be fed one chunk at a time.
+
+The summary tabs only need counts, per-product sums, a few crosstabs and the
+mean/std of the numeric columns. All of them are slices of one small
+``AggregateCube``; ``StreamingSummary`` pairs it with a bounded uniform sample
+of rows for the row-level views, so exports far larger than RAM can still be
+summarized. It also keeps a ``CovarianceState`` for the correlation views and
+``sketches.ColumnSketches`` for the quantile-based ones.
+"""
+import numpy as np
+import pandas as pd
+
+import data_loader
+import sketches
+
+SAMPLE_ROWS = 50_000
+
+# Every summary chart is a slice of Product x Gender x Age_category x
+# Fitness_category x MaritalStatus, so the cube is built over exactly these.
+CUBE_DIMENSIONS = ("Product", "Gender", "Age_category", "Fitness_category", "MaritalStatus")
+CUBE_MEASURES = ("Age", "Education", "Usage", "Fitness", "Income", "Miles", "Product_price")
+
+# Display order for label columns that are not simply sorted.
+LEVEL_ORDER = {"Age_category": data_loader.AGE_LABELS}
+
+
+def _order_levels(labels, column):
+    order = LEVEL_ORDER.get(column)
+    if order is None:
+        return sorted(labels)
+    return [label for label in order if label in labels]
+
+
+def _pool(table, by, **groupby_kwargs):
+    """Cube rows summed per level of ``by``, with ``m2_`` columns pooled by Chan's formula.
+
+    The pooled M2 of several cells is the sum of theirs plus, for each cell,
+    ``count * (cell mean - pooled mean)**2``. ``by=[]`` pools every row.
+    """
+    table = table.copy()
+    grouped = table.groupby(by, **groupby_kwargs) if by else None
+    count = grouped["count"].transform("sum") if by else table["count"].sum()
+    for measure in CUBE_MEASURES:
+        total = grouped[f"sum_{measure}"].transform("sum") if by else table[f"sum_{measure}"].sum()
+        spread = table[f"sum_{measure}"] / table["count"] - total / count
+        table[f"m2_{measure}"] = table[f"m2_{measure}"] + table["count"] * spread * spread
+    if not by:
+        return table.drop(columns=list(CUBE_DIMENSIONS)).sum()
+    return table.groupby(by, **groupby_kwargs).sum(numeric_only=True)
+
+
+class AggregateCube:
+    """Counts, sums and centered sums of squares per cell of the dimension cube.
+
+    The table has one row per observed combination of ``CUBE_DIMENSIONS`` and
+    ``count``, ``sum_<measure>`` and ``m2_<measure>`` columns, M2 being the sum
+    of squared deviations from the cell mean. Cells are merged with Chan's
+    formula, so the variance never comes from subtracting two large sums of
+    squares. Its size is bounded by the number of label combinations, not by
+    the number of rows.
+    """
+
+    def __init__(self, table=None):
+        self.table = table
+
+    @classmethod
+    def from_frame(cls, df):
+        df = data_loader.ensure_columns(df, CUBE_DIMENSIONS + CUBE_MEASURES)
+        dimensions = list(CUBE_DIMENSIONS)
+        values = df[list(CUBE_MEASURES)].astype("float64")
+        grouped = pd.concat([df[dimensions], values], axis=1).groupby(dimensions, observed=True, dropna=False)
+        centered = pd.concat([df[dimensions], (values - grouped.transform("mean")).pow(2)], axis=1)
+        table = pd.concat(
+            [grouped.sum().add_prefix("sum_"), centered.groupby(dimensions, observed=True, dropna=False).sum().add_prefix("m2_")],
+            axis=1,
+        )
+        table.insert(0, "count", grouped.size())
+        table = table.reset_index()
+        # Plain labels so cubes built from chunks with different categories merge.
+        for dimension in dimensions:
+            table[dimension] = table[dimension].astype(object)
+        return cls(table)
+
+    def merge(self, other):
+        if other.table is None:
+            return self
+        if self.table is None:
+            self.table = other.table
+            return self
+        combined = pd.concat([self.table, other.table], ignore_index=True)
+        self.table = _pool(combined, list(CUBE_DIMENSIONS), dropna=False, sort=False).reset_index()
+        return self
+
+    def update(self, chunk):
+        return self.merge(AggregateCube.from_frame(chunk))
+
+    def _rollup(self, by):
+        by = [by] if isinstance(by, str) else list(by)
+        if not by:
+            return self.table.drop(columns=list(CUBE_DIMENSIONS)).sum()
+        return self.table.groupby(by).sum(numeric_only=True)
+
+    @property
+    def n_rows(self):
+        return 0 if self.table is None else int(self.table["count"].sum())
+
+    def counts(self, by):
+        return self._rollup(by)["count"].astype("int64")
+
+    def sum(self, measure, by=()):
+        return self._rollup(by)[f"sum_{measure}"]
+
+    def mean(self, measure, by=()):
+        rollup = self._rollup(by)
+        return rollup[f"sum_{measure}"] / rollup["count"]
+
+    def std(self, measure, by=()):
+        """Sample standard deviation (ddof=1), like ``Series.std``."""
+        by = [by] if isinstance(by, str) else list(by)
+        pooled = _pool(self.table, by)
+        return np.sqrt(pooled[f"m2_{measure}"] / (pooled["count"] - 1))
+
+    def crosstab(self, index, columns):
+        return self.counts([index, columns]).unstack(fill_value=0)
+
+
+class CovarianceState:
+    """Count, means and co-moment matrix of the numeric measures.
+
+    Chunks are folded in with the pairwise (Chan et al.) form of Welford's
+    update: a chunk's own means and centered cross-products are combined with
+    the running ones, so absorbing ``m`` new rows costs O(m) whatever the
+    total, and states built from separate partitions merge exactly.
+    """
+
+    def __init__(self, columns=CUBE_MEASURES):
+        self.columns = list(columns)
+        self.n = 0
+        self.means = np.zeros(len(self.columns))
+        self.comoments = np.zeros((len(self.columns), len(self.columns)))
+
+    @classmethod
+    def from_frame(cls, df, columns=CUBE_MEASURES):
+        state = cls(columns)
+        df = data_loader.ensure_columns(df, state.columns)
+        values = df[state.columns].to_numpy(dtype=np.float64)
+        if len(values):
+            state.n = len(values)
+            state.means = values.mean(axis=0)
+            centered = values - state.means
+            state.comoments = centered.T @ centered
+        return state
+
+    def merge(self, other):
+        if not other.n:
+            return self
+        n = self.n + other.n
+        delta = other.means - self.means
+        self.comoments = self.comoments + other.comoments + np.outer(delta, delta) * (self.n * other.n / n)
+        self.means = self.means + delta * (other.n / n)
+        self.n = n
+        return self
+
+    def update(self, chunk):
+        return self.merge(CovarianceState.from_frame(chunk, self.columns))
+
+    def cov(self):
+        """Sample covariance matrix (ddof=1), like ``DataFrame.cov``."""
+        return pd.DataFrame(self.comoments / (self.n - 1), index=self.columns, columns=self.columns)
+
+    def corr(self):
+        """Pearson correlation matrix, like ``DataFrame.corr``."""
+        scale = np.sqrt(np.diag(self.comoments))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.comoments / np.outer(scale, scale)
+        np.fill_diagonal(corr, 1.0)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def strongest(self, n=3):
+        """The ``n`` column pairs with the largest absolute correlation."""
+        corr = self.corr()
+        pairs = corr.where(np.triu(np.ones(corr.shape, dtype=bool), k=1)).stack()
+        return pairs.reindex(pairs.abs().sort_values(ascending=False).index)[:n]
+
+
+class StreamingSummary:
+    """Cube, covariance, column sketches and a bounded row sample, fed one chunk at a time."""
+
+    def __init__(self, sample_size=SAMPLE_ROWS, seed=0):
+        self.cube = AggregateCube()
+        self.covariance = CovarianceState()
+        self.sketches = sketches.ColumnSketches(seed=seed)
+        self._sample_size = sample_size
+        self._rng = np.random.default_rng(seed)
+        self._sample = None
+        self._sample_keys = np.empty(0)
+
+    def update(self, chunk):
+        """Fold one preprocessed chunk into every aggregate and the sample."""
+        chunk = data_loader.ensure_columns(chunk, CUBE_DIMENSIONS + CUBE_MEASURES)
+        self.cube.update(chunk)
+        self.covariance.update(chunk)
+        self.sketches.update(chunk)
+        self._update_sample(chunk)
+        return self
+
+    def merge(self, other):
+        """Fold in a summary built from another partition of the rows."""
+        self.cube.merge(other.cube)
+        self.covariance.merge(other.covariance)
+        self.sketches.merge(other.sketches)
+        if other._sample is not None:
+            self._absorb_sample(other._sample, other._sample_keys)
+        return self
+
+    def _update_sample(self, chunk):
+        if self._sample_size == 0:
+            return
+        self._absorb_sample(chunk, self._rng.random(len(chunk)))
+
+    def _absorb_sample(self, rows, keys):
+        # Keep the rows with the smallest random keys seen so far: a uniform
+        # sample without replacement, maintained one chunk at a time.
+        if self._sample is None:
+            pool, pool_keys = rows, keys
+        else:
+            pool = pd.concat([self._sample, rows], ignore_index=True)
+            pool_keys = np.concatenate([self._sample_keys, keys])
+        if len(pool) > self._sample_size:
+            keep = np.sort(np.argpartition(pool_keys, self._sample_size)[:self._sample_size])
+            pool, pool_keys = pool.iloc[keep], pool_keys[keep]
+        self._sample = pool.reset_index(drop=True)
+        self._sample_keys = pool_keys
+
+    @property
+    def n_rows(self):
+        return self.cube.n_rows
+
+    @property
+    def product_counts(self):
+        """Units sold per product, most popular first (like ``value_counts``)."""
+        return self.cube.counts("Product").sort_values(ascending=False, kind="stable").rename("count")
+
+    @property
+    def gender_counts(self):
+        return self.cube.counts("Gender").sort_values(ascending=False, kind="stable").rename("count")
+
+    @property
+    def revenue(self):
+        return self.cube.sum("Product_price", by="Product").astype("int64")
+
+    def crosstab(self, column, normalize=None):
+        """Product x ``column`` counts, or column-normalized percentages."""
+        table = self.cube.crosstab("Product", column)
+        table = table[_order_levels(table.columns, column)].sort_index()
+        if normalize == "columns":
+            return table.div(table.sum(axis=0), axis=1).mul(100).round(2)
+        return table
+
+    def mean(self, column, by=()):
+        return self.cube.mean(column, by)
+
+    def std(self, column, by=()):
+        return self.cube.std(column, by)
+
+    @property
+    def sample(self):
+        """A bounded uniform sample of rows for the row-level views."""
+        if self._sample is None:
+            return pd.DataFrame()
+        sample = self._sample.copy()
+        for column, dtype in data_loader.SCHEMA.items():
+            if dtype == "category":
+                sample[column] = sample[column].astype("category")
+        sample["Age_category"] = pd.Categorical(sample["Age_category"], categories=data_loader.AGE_LABELS, ordered=True)
+        return sample
+
+
+def summarize_frame(df, seed=0):
+    """Summary of a frame that is already in memory."""
+    return StreamingSummary(sample_size=0, seed=seed).update(df)
+
+
+def summarize_csv(path=data_loader.DATA_FILE, chunksize=data_loader.CHUNK_ROWS, stop=None):
+    """Summary of a CSV's complete lines before byte ``stop``, read in fixed-size chunks."""
+    summary = StreamingSummary()
+    for chunk in data_loader.iter_chunks(path, chunksize=chunksize, stop=stop):
+        summary.update(chunk)
+    return summary
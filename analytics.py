@@ -0,0 +1,134 @@
+"""Streamlit-free analytics behind the dashboard tabs, and a batch precompute job.
+
+``compute()`` does the expensive work in one pass over the export: the summary
+(cube, covariance, sketches and, for large exports, the row sample), the box
+and violin statistics by product and overall, and the data dictionary's
+describe table. ``save()`` writes the result as a compressed snapshot next to
+the columnar sidecar; ``load()`` returns it only while the CSV is unchanged, so
+a new server process can skip all of it.
+
+Usage: python analytics.py [csv] [--workers N]
+"""
+import argparse
+import gzip
+import logging
+import os
+import pickle
+import tempfile
+import time
+from datetime import datetime
+
+import aggregates
+import data_loader
+import distributions
+import parallel
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = ".snapshot.pkl.gz"
+SNAPSHOT_FORMAT = 4
+
+
+class Snapshot:
+    """Everything the tabs compute from the rows, tied to one version of the CSV.
+
+    ``source`` is the CSV's ``data_loader.source_key`` plus ``stop``, the end
+    of the complete lines the results cover. ``distributions`` maps
+    ``"Product"`` and ``None`` (overall) to the frames returned by
+    ``distributions.distribution_stats``.
+    """
+
+    def __init__(self, source, streaming, summary, distributions, describe):
+        self.format = SNAPSHOT_FORMAT
+        self.source = source
+        self.streaming = streaming
+        self.summary = summary
+        self.distributions = distributions
+        self.describe = describe
+        self.created = datetime.now().isoformat(timespec="seconds")
+
+    @property
+    def precomputed(self):
+        """The per-version results the dashboard would otherwise compute, read-only."""
+        return {
+            "distributions": {by: data_loader.share(stats) for by, stats in self.distributions.items()},
+            "describe": data_loader.share(self.describe),
+        }
+
+
+def snapshot_path(path=data_loader.DATA_FILE):
+    return data_loader.cache_path(path, SNAPSHOT_SUFFIX)
+
+
+def compute(path=data_loader.DATA_FILE, workers=parallel.WORKERS):
+    """Summarize the export and precompute every tab's statistics."""
+    source = data_loader.source_key(path)
+    # Like the dashboard, leave out a last row the feed is still writing.
+    source["stop"] = data_loader.complete_lines_end(path, 0, source["size"])
+    streaming = data_loader.use_streaming(path)
+    if streaming:
+        summary = aggregates.summarize_csv(path, stop=source["stop"])
+        df = summary.sample
+        stats = {by: distributions.sketch_stats(summary.sketches, by=by) for by in ("Product", None)}
+    else:
+        df = data_loader.load_dataset(path, stop=source["stop"])
+        summary = parallel.summarize(df, workers=workers)
+        stats = {by: distributions.distribution_stats(df, by=by) for by in ("Product", None)}
+    describe = data_loader.describe(df)
+    if data_loader.source_key(path) != {key: source[key] for key in ("size", "mtime_ns", "hash")}:
+        raise RuntimeError(f"{path} changed while the snapshot was computed")
+    return Snapshot(source, streaming, summary, stats, describe)
+
+
+def save(snapshot, path=data_loader.DATA_FILE):
+    """Write ``snapshot`` atomically next to ``path``'s other caches."""
+    target = snapshot_path(path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wb", compresslevel=6) as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return target
+
+
+def load(path=data_loader.DATA_FILE):
+    """The saved snapshot for ``path`` if there is one and the CSV is unchanged."""
+    target = snapshot_path(path)
+    if not os.path.exists(target):
+        return None
+    try:
+        with gzip.open(target, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable snapshot {target}: {e}")
+        return None
+    if getattr(snapshot, "format", None) != SNAPSHOT_FORMAT:
+        return None
+    if snapshot.streaming != data_loader.use_streaming(path) or not data_loader.source_matches(path, snapshot.source):
+        logger.info(f"Snapshot {target} is stale")
+        return None
+    return snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the dashboard snapshot for a customer export.")
+    parser.add_argument("csv", nargs="?", default=data_loader.DATA_FILE)
+    parser.add_argument("--workers", type=int, default=parallel.WORKERS,
+                        help="processes for the summary (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    snapshot = compute(args.csv, workers=args.workers)
+    target = save(snapshot, args.csv)
+    print(f"{snapshot.summary.n_rows:,} rows summarized in {time.perf_counter() - start:.2f} s")
+    print(f"Wrote {target} ({os.path.getsize(target) / 1024:,.0f} KB)")
+
+
+if __name__ == "__main__":
+    # Run from the importable module so pickled snapshots reference analytics.Snapshot.
+    import analytics
+    analytics.main()
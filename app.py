@@ -1,27 +1,31 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import copy
+import functools
+import html
 import logging
+import uuid
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(
-    filename='app.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+import profiling
+
+# Heavy libraries are imported (and timed) here only when the data path needs
+# them; Plotly is deferred until the first chart of a section is built.
+with profiling.profiler.phase("imports"):
+    profiling.profiler.preload("numpy", "pandas", "pyarrow")
+    go = profiling.profiler.lazy("plotly.graph_objects")
+    import app_logging
+    import charts
+    import data_loader
+    import dataset
+    import distributions
+    import indexes
+    import kpis
+    import parallel
 
-# Create logger
+# Configure logging (once per process; reruns reuse the running writer)
 logger = logging.getLogger(__name__)
-logger.info("="*50)
-logger.info("Application Started")
-logger.info("="*50)
+if app_logging.setup_logging():
+    logger.info("Application Started")
 
 # Page Configuration
 st.set_page_config(
@@ -31,6 +35,20 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Every rerun records its sections, charts and data steps for the Performance view
+st.session_state.setdefault("perf_session", uuid.uuid4().hex[:8])
+trace = profiling.renders.start(st.session_state["perf_session"])
+
+def traced_step(name):
+    """Record each call of a data step (cache hits included) as a span of the current rerun."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace.span("data", name, rows=profiling.row_count(args[0]) if args else None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
 # Custom CSS with enhanced dark theme
 st.markdown("""
 <style>
@@ -122,8 +140,26 @@ st.markdown("""
         box-shadow: 0 6px 20px rgba(139, 92, 246, 0.6);
         transform: translateY(-2px);
     }
-    
-    [data-testid="stSidebar"] { 
+
+    .stRadio [role="radiogroup"] {
+        gap: 12px;
+        background-color: rgba(17, 24, 39, 0.5);
+        padding: 0.5rem;
+        border-radius: 12px;
+    }
+    .stRadio [role="radiogroup"] label {
+        background: linear-gradient(135deg, rgba(139, 92, 246, 0.1) 0%, rgba(244, 114, 182, 0.1) 100%);
+        border-radius: 10px;
+        padding: 8px 20px;
+        border: 1px solid rgba(139, 92, 246, 0.3);
+        transition: all 0.3s ease;
+    }
+    .stRadio [role="radiogroup"] label:has(input:checked) {
+        background: linear-gradient(135deg, #8b5cf6 0%, #ec4899 100%);
+        box-shadow: 0 6px 20px rgba(139, 92, 246, 0.6);
+    }
+
+    [data-testid="stSidebar"] {
         background: linear-gradient(180deg, #1e1b4b 0%, #312e81 100%); 
         border-right: 1px solid rgba(139, 92, 246, 0.3);
     }
@@ -315,59 +351,131 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
-# Load Data
-@st.cache_data
-def load_data():
-    logger.info("Loading data from aerofit_treadmill.csv")
-    df = pd.read_csv("aerofit_treadmill.csv")
-    logger.info(f"Data loaded successfully: {len(df)} rows, {df.shape[1]} columns")
-    return df
+# The export and its summary live once per process and absorb appended rows;
+# only a rewrite of already processed bytes reloads everything.
+@st.cache_resource
+def get_dataset():
+    return dataset.AppendableDataset(data_loader.DATA_FILE, summarize=parallel.summarize)
+
+# Shared, read-only per-version results (see README "Multiple Server Processes"); the latest two versions are kept.
+VERSIONS_KEPT = 2
+
+# Column summary table for the data dictionary
+@traced_step("describe")
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def describe_data(_df, data_version):
+    if "describe" in precomputed:
+        return precomputed["describe"]
+    return data_loader.share(data_loader.describe(_df))
+
+# Box and violin statistics per numeric feature, by product or overall (by=None)
+@st.cache_resource(max_entries=2 * VERSIONS_KEPT)
+def distribution_summary(_df, data_version, by="Product"):
+    return data_loader.share(distributions.distribution_stats(_df, by=by))
+
+@st.cache_resource(max_entries=2 * VERSIONS_KEPT)
+def sketch_distribution_summary(_summary, data_version, by="Product"):
+    return data_loader.share(distributions.sketch_stats(_summary.sketches, by=by))
 
-# Preprocessing
-@st.cache_data
-def preprocess_data(df):
-    logger.info("Starting data preprocessing")
-    product_prices = {"KP281": 1500, "KP481": 1750, "KP781": 2500}
-    df["Product_price"] = df["Product"].map(product_prices)
-    
-    fitness_map = {1: "Poor Shape", 2: "Bad Shape", 3: "Average Shape", 4: "Good Shape", 5: "Excellent Shape"}
-    df["Fitness_category"] = df["Fitness"].map(fitness_map)
-    
-    bins = [0, 21, 35, 45, 60]
-    labels = ["Teen (0-21)", "Adult (22-35)", "Mid-age (36-45)", "Towards old-age (>46)"]
-    df["Age_category"] = pd.cut(df["Age"], bins=bins, labels=labels, include_lowest=True)
-    
-    logger.info("Data preprocessing completed: Added Product_price, Fitness_category, Age_category")
-    return df
+@traced_step("distributions")
+def distribution_view(by="Product"):
+    """Exact statistics for in-memory data; sketch-based ones when streaming."""
+    if "distributions" in precomputed:
+        return precomputed["distributions"][by]
+    if streaming:
+        return sketch_distribution_summary(summary, data_version, by)
+    return distribution_summary(df, data_version, by)
 
-try:
-    df_raw = load_data()
-    df = preprocess_data(df_raw.copy())
-    logger.info("Data ready for analysis")
-except FileNotFoundError:
-    logger.error("File 'aerofit_treadmill.csv' not found")
-    st.error("❌ File 'aerofit_treadmill.csv' not found. Please ensure it is in the same directory.")
-    st.stop()
+# Figures quoted in the Probability, Insights and Complete Analysis tabs,
+# evaluated together from the cube once per data version
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def evaluate_kpis(_summary, _df, data_version):
+    return kpis.evaluate(_summary, df=_df)
+
+@traced_step("kpis")
+def kpi_values(summary, data_version):
+    # Quantiles come from the rows when they are all here, not only a sample.
+    return copy.deepcopy(evaluate_kpis(summary, None if streaming else df, data_version))
+
+# Explorer filter indexes, shared by all sessions and built once per data version
+@traced_step("filter index")
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def build_filter_index(_df, data_version):
+    logger.info("Building explorer filter indexes")
+    return indexes.FilterIndex(_df)
+
+with profiling.profiler.phase("data load"):
+    try:
+        live_dataset = get_dataset()
+        with trace.span("data", "dataset refresh") as span:
+            df, summary, data_version, precomputed = live_dataset.current()
+            span["rows"] = summary.n_rows
+        streaming = live_dataset.streaming
+        logger.debug("Data ready for analysis")
+    except FileNotFoundError:
+        logger.error("File 'aerofit_treadmill.csv' not found")
+        st.error("❌ File 'aerofit_treadmill.csv' not found. Please ensure it is in the same directory.")
+        st.stop()
+    except ValueError as e:
+        logger.exception("Could not parse 'aerofit_treadmill.csv'")
+        st.error(f"❌ 'aerofit_treadmill.csv' does not match the expected columns and types: {e}")
+        st.stop()
+
+if streaming:
+    st.warning(f"⚡ Large export: summaries cover all {summary.n_rows:,} rows; row-level charts and the explorer use a uniform sample of {len(df):,} rows.")
 
 # Tabs
-tabs = st.tabs(["📊 Data Overview", "🔍 Interactive EDA", "🎲 Probability Analysis", "💡 Insights & Recommendations", "📚 Complete Analysis", "📝 Logs"])
-logger.info("Main tabs created")
+# Navigation: only the selected section runs its data work and builds figures.
+# Widgets of hidden sections are not rendered, so their values are re-assigned
+# here to keep them alive in session state until the user comes back.
+PERSISTENT_WIDGETS = [
+    "explorer_products", "explorer_genders", "explorer_marital", "explorer_age",
+    "explorer_income", "explorer_usage", "explorer_fitness", "explorer_sort", "explorer_desc",
+    "explorer_page_size", "explorer_page", "eda_section", "eda_feature", "log_level", "log_search", "perf_kinds",
+]
+for key in PERSISTENT_WIDGETS:
+    if key in st.session_state:
+        st.session_state[key] = st.session_state[key]
+
+def section_selector(options, key):
+    return st.radio("Section", options, horizontal=True, key=key, label_visibility="collapsed")
+
+# Built figures are kept in a process-wide LRU keyed by chart id, the widget
+# state the chart depends on and the data version, so unchanged charts are not
+# rebuilt on every rerun.
+@st.cache_resource
+def get_figure_cache():
+    return charts.FigureCache()
+
+def show_chart(chart_id, build, **state):
+    """Draw a cached (or newly built) figure, recording its time and JSON payload."""
+    with trace.span("chart", chart_id) as span:
+        fig, span["bytes"] = get_figure_cache().get_or_build_sized(chart_id, state, data_version, build)
+        st.plotly_chart(fig, use_container_width=True)
+
+# Wording for correlation callouts
+def column_label(column):
+    return column.replace('_', ' ').title()
+
+def correlation_strength(r):
+    r = round(r, 2)
+    size = 'Strong' if abs(r) >= 0.7 else 'Moderate' if abs(r) >= 0.4 else 'Weak'
+    return f"{size} {'positive' if r >= 0 else 'negative'}"
 
 # TAB 1: Enhanced Data Overview
-with tabs[0]:
+def render_data_overview():
     st.header("📊 Data Overview")
-    logger.info("Data Overview tab accessed")
     
     # Animated Metrics
     m1, m2, m3, m4 = st.columns(4)
     with m1: 
-        st.metric("Total Customers", f"{len(df):,}", "Rows", help="Total number of customer records")
+        st.metric("Total Customers", f"{summary.n_rows:,}", "Rows", help="Total number of customer records")
     with m2: 
-        st.metric("Features", f"{df.shape[1]}", "Columns", help="Number of data features")
+        st.metric("Features", f"{len(data_loader.column_names())}", "Columns", help="Number of data features")
     with m3: 
-        st.metric("Avg Income", f"${df['Income'].mean():,.0f}", f"±${df['Income'].std():,.0f}")
+        st.metric("Avg Income", f"${summary.mean('Income'):,.0f}", f"±${summary.std('Income'):,.0f}")
     with m4: 
-        st.metric("Avg Miles", f"{df['Miles'].mean():.0f}", f"±{df['Miles'].std():.0f} mi/wk")
+        st.metric("Avg Miles", f"{summary.mean('Miles'):.0f}", f"±{summary.std('Miles'):.0f} mi/wk")
     
     st.markdown("---")
     
@@ -386,30 +494,32 @@ with tabs[0]:
         </div>
         """, unsafe_allow_html=True)
         
-        product_counts = df['Product'].value_counts()
-        fig = go.Figure(data=[go.Bar(
-            x=product_counts.index,
-            y=product_counts.values,
-            marker=dict(
-                color=['#667eea', '#f093fb', '#11998e'],
-                line=dict(color='rgba(255,255,255,0.3)', width=2)
-            ),
-            text=product_counts.values,
-            textposition='outside',
-            hovertemplate='<b>%{x}</b><br>Count: %{y}<br>Percentage: %{y:.1%}<extra></extra>'
-        )])
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            xaxis=dict(showgrid=False),
-            yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        product_counts = summary.product_counts
+        def build_figure():
+            fig = go.Figure(data=[go.Bar(
+                x=product_counts.index,
+                y=product_counts.values,
+                marker=dict(
+                    color=['#667eea', '#f093fb', '#11998e'],
+                    line=dict(color='rgba(255,255,255,0.3)', width=2)
+                ),
+                text=product_counts.values,
+                textposition='outside',
+                hovertemplate='<b>%{x}</b><br>Count: %{y}<br>Percentage: %{y:.1%}<extra></extra>'
+            )])
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                xaxis=dict(showgrid=False),
+                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
+                height=400
+            )
+            return fig
+        show_chart("overview_products", build_figure)
         
         st.success(f"""
-        **Key Insight:** KP281 accounts for {(product_counts['KP281']/len(df)*100):.1f}% of total sales, 
+        **Key Insight:** KP281 accounts for {(product_counts['KP281']/summary.n_rows*100):.1f}% of total sales, 
         making it the market leader. This suggests strong price sensitivity among customers.
         """)
     
@@ -424,23 +534,25 @@ with tabs[0]:
         </div>
         """, unsafe_allow_html=True)
         
-        revenue = df.groupby('Product')['Product_price'].sum()
-        fig = go.Figure(data=[go.Pie(
-            labels=revenue.index,
-            values=revenue.values,
-            hole=0.4,
-            marker=dict(colors=['#667eea', '#f093fb', '#11998e']),
-            textinfo='label+percent',
-            hovertemplate='<b>%{label}</b><br>Revenue: $%{value:,.0f}<extra></extra>'
-        )])
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            height=400,
-            showlegend=False
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        revenue = summary.revenue
+        def build_figure():
+            fig = go.Figure(data=[go.Pie(
+                labels=revenue.index,
+                values=revenue.values,
+                hole=0.4,
+                marker=dict(colors=['#667eea', '#f093fb', '#11998e']),
+                textinfo='label+percent',
+                hovertemplate='<b>%{label}</b><br>Revenue: $%{value:,.0f}<extra></extra>'
+            )])
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                height=400,
+                showlegend=False
+            )
+            return fig
+        show_chart("overview_revenue", build_figure)
         
         total_revenue = revenue.sum()
         kp781_revenue_pct = (revenue['KP781']/total_revenue*100)
@@ -454,32 +566,75 @@ with tabs[0]:
     # Interactive Data Table
     st.subheader("🔍 Interactive Data Explorer")
     
+    filter_index = build_filter_index(df, data_version)
+    
     col_filter1, col_filter2, col_filter3 = st.columns(3)
     with col_filter1:
-        product_filter = st.multiselect("Filter by Product", df['Product'].unique(), default=df['Product'].unique())
+        st.session_state.setdefault("explorer_products", filter_index.levels("Product"))
+        product_filter = st.multiselect("Filter by Product", filter_index.levels("Product"), key="explorer_products")
     with col_filter2:
-        gender_filter = st.multiselect("Filter by Gender", df['Gender'].unique(), default=df['Gender'].unique())
+        st.session_state.setdefault("explorer_genders", filter_index.levels("Gender"))
+        gender_filter = st.multiselect("Filter by Gender", filter_index.levels("Gender"), key="explorer_genders")
     with col_filter3:
-        age_range = st.slider("Age Range", int(df['Age'].min()), int(df['Age'].max()), (int(df['Age'].min()), int(df['Age'].max())))
-    
-    filtered_df = df[
-        (df['Product'].isin(product_filter)) & 
-        (df['Gender'].isin(gender_filter)) &
-        (df['Age'] >= age_range[0]) &
-        (df['Age'] <= age_range[1])
-    ]
-    
-    st.info(f"📊 Showing **{len(filtered_df)}** of **{len(df)}** records")
-    st.dataframe(filtered_df, use_container_width=True, height=400)
+        st.session_state.setdefault("explorer_marital", filter_index.levels("MaritalStatus"))
+        marital_filter = st.multiselect("Filter by Marital Status", filter_index.levels("MaritalStatus"), key="explorer_marital")
+    
+    col_filter4, col_filter5, col_filter6, col_filter7 = st.columns(4)
+    with col_filter4:
+        st.session_state.setdefault("explorer_age", filter_index.bounds("Age"))
+        age_range = st.slider("Age Range", *filter_index.bounds("Age"), key="explorer_age")
+    with col_filter5:
+        st.session_state.setdefault("explorer_income", filter_index.bounds("Income"))
+        income_range = st.slider("Income Range", *filter_index.bounds("Income"), step=1000, key="explorer_income")
+    with col_filter6:
+        st.session_state.setdefault("explorer_usage", filter_index.bounds("Usage"))
+        usage_range = st.slider("Usage (times/week)", *filter_index.bounds("Usage"), key="explorer_usage")
+    with col_filter7:
+        st.session_state.setdefault("explorer_fitness", filter_index.levels("Fitness"))
+        fitness_filter = st.multiselect("Fitness Level", filter_index.levels("Fitness"), key="explorer_fitness")
+    
+    with trace.span("data", "explorer filter", rows=len(df)):
+        positions = filter_index.select(
+            levels={"Product": product_filter, "Gender": gender_filter, "MaritalStatus": marital_filter, "Fitness": fitness_filter},
+            ranges={"Age": age_range, "Income": income_range, "Usage": usage_range},
+        )
+    n_matches = len(positions)
+    
+    # Sorting and paging happen here; only the visible page is sent to the browser.
+    col_sort, col_order, col_size, col_page = st.columns([2, 1, 1, 1])
+    with col_sort:
+        sort_by = st.selectbox("Sort by", ["(file order)"] + data_loader.column_names(), key="explorer_sort")
+    with col_order:
+        descending = st.toggle("Descending", key="explorer_desc")
+    with col_size:
+        st.session_state.setdefault("explorer_page_size", 50)
+        page_size = st.selectbox("Rows per page", [25, 50, 100, 250], key="explorer_page_size")
+    n_pages = max(1, -(-n_matches // page_size))
+    if st.session_state.get("explorer_page", 1) > n_pages:
+        st.session_state["explorer_page"] = n_pages
+    with col_page:
+        page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, step=1, key="explorer_page")
+    
+    with trace.span("data", "explorer sort & page", rows=n_matches):
+        if sort_by != "(file order)":
+            positions = filter_index.order_by(positions, indexes.sort_keys(data_loader.derived(df, sort_by)), sort_by, descending)
+        elif descending:
+            positions = positions[::-1]
+        start, stop = indexes.page_slice(n_matches, page, page_size)
+        # Derived columns not computed for the whole frame are computed for this page only.
+        page_df = data_loader.add_derived_columns(df.iloc[positions[start:stop]])[data_loader.column_names()]
+    
+    st.info(f"📊 **{n_matches:,}** of **{len(df):,}** records match — showing {start + 1 if n_matches else 0:,}–{stop:,}" + (f" (sampled from {summary.n_rows:,})" if streaming else ""))
+    with trace.span("table", "explorer page", rows=len(page_df), bytes=profiling.frame_bytes(page_df)):
+        st.dataframe(page_df, use_container_width=True, height=400)
 
 # TAB 2: Interactive EDA with Plotly
-with tabs[1]:
+def render_interactive_eda():
     st.header("🔍 Interactive Exploratory Data Analysis")
-    logger.info("Interactive EDA tab accessed")
     
-    viz_tabs = st.tabs(["📈 Distributions", "🔗 Relationships", "🎨 Multivariate", "⚠️ Outliers"])
+    viz_section = section_selector(["📈 Distributions", "🔗 Relationships", "🎨 Multivariate", "⚠️ Outliers"], key="eda_section")
     
-    with viz_tabs[0]:
+    if viz_section == "📈 Distributions":
         st.subheader("Distribution Analysis")
         
         st.markdown("""
@@ -499,28 +654,30 @@ with tabs[1]:
             st.markdown("**Gender Distribution**")
             st.caption("📌 Shows the split between male and female customers")
             
-            gender_counts = df['Gender'].value_counts()
-            fig = go.Figure(data=[go.Bar(
-                x=gender_counts.index,
-                y=gender_counts.values,
-                marker=dict(
-                    color=['#8b5cf6', '#ec4899'],
-                    line=dict(color='rgba(255,255,255,0.3)', width=2)
-                ),
-                text=gender_counts.values,
-                textposition='outside'
-            )])
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1'),
-                xaxis=dict(showgrid=False),
-                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
-                height=350
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            gender_counts = summary.gender_counts
+            def build_figure():
+                fig = go.Figure(data=[go.Bar(
+                    x=gender_counts.index,
+                    y=gender_counts.values,
+                    marker=dict(
+                        color=['#8b5cf6', '#ec4899'],
+                        line=dict(color='rgba(255,255,255,0.3)', width=2)
+                    ),
+                    text=gender_counts.values,
+                    textposition='outside'
+                )])
+                fig.update_layout(
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#cbd5e1'),
+                    xaxis=dict(showgrid=False),
+                    yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
+                    height=350
+                )
+                return fig
+            show_chart("eda_gender", build_figure)
             
-            male_pct = (gender_counts['Male']/len(df)*100)
+            male_pct = (gender_counts['Male']/summary.n_rows*100)
             st.info(f"""
             **Gender Insight:** Males represent {male_pct:.1f}% of customers. 
             This slight male majority suggests opportunities for targeted female marketing campaigns.
@@ -530,26 +687,32 @@ with tabs[1]:
             st.markdown("**Age Distribution**")
             st.caption("📌 Histogram showing age spread across customer base")
             
-            fig = go.Figure(data=[go.Histogram(
-                x=df['Age'],
-                nbinsx=20,
-                marker=dict(
-                    color='#8b5cf6',
-                    line=dict(color='rgba(255,255,255,0.3)', width=1)
+            def build_figure():
+                age_bins = summary.sketches.histogram('Age')
+                left, counts = age_bins.bins()
+                fig = go.Figure(data=[go.Bar(
+                    x=left + age_bins.width / 2,
+                    y=counts,
+                    width=age_bins.width,
+                    marker=dict(
+                        color='#8b5cf6',
+                        line=dict(color='rgba(255,255,255,0.3)', width=1)
+                    )
+                )])
+                fig.update_layout(
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#cbd5e1'),
+                    xaxis=dict(showgrid=False, title='Age'),
+                    yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title='Count'),
+                    height=350
                 )
-            )])
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1'),
-                xaxis=dict(showgrid=False, title='Age'),
-                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title='Count'),
-                height=350
-            )
-            st.plotly_chart(fig, use_container_width=True)
+                return fig
+            show_chart("eda_age_histogram", build_figure)
             
-            median_age = df['Age'].median()
-            age_range = f"{df['Age'].min()}-{df['Age'].max()}"
+            age_stats = distribution_view(by=None).loc[('Age', distributions.OVERALL)]
+            median_age = age_stats['median']
+            age_range = f"{age_stats['min']:.0f}-{age_stats['max']:.0f}"
             st.info(f"""
             **Age Insight:** Median age is {median_age:.0f} years (range: {age_range}). 
             The distribution shows concentration in the 22-35 age group, our core demographic.
@@ -560,7 +723,7 @@ with tabs[1]:
         st.markdown("**📊 Explore Numerical Features by Product**")
         st.caption("📌 Compare how different products perform across various metrics")
         
-        num_feature = st.selectbox("Select Feature", ['Income', 'Miles', 'Usage', 'Fitness'])
+        num_feature = st.selectbox("Select Feature", ['Income', 'Miles', 'Usage', 'Fitness'], key="eda_feature")
         
         feature_descriptions = {
             'Income': 'Annual income levels show purchasing power and product affordability',
@@ -577,26 +740,20 @@ with tabs[1]:
         </div>
         """, unsafe_allow_html=True)
         
-        fig = go.Figure()
-        for product in df['Product'].unique():
-            product_data = df[df['Product'] == product][num_feature]
-            fig.add_trace(go.Box(
-                y=product_data,
-                name=product,
-                boxmean='sd'
-            ))
-        
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title=num_feature),
-            xaxis=dict(showgrid=False, title='Product'),
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def build_figure():
+            fig = charts.box_figure(distribution_view(), num_feature)
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title=num_feature),
+                xaxis=dict(showgrid=False, title='Product'),
+                height=400
+            )
+            return fig
+        show_chart("eda_feature_box", build_figure, feature=num_feature)
     
-    with viz_tabs[1]:
+    if viz_section == "🔗 Relationships":
         st.subheader("Relationship Analysis")
         
         st.markdown("""
@@ -615,21 +772,23 @@ with tabs[1]:
             st.markdown("**Product vs Gender**")
             st.caption("📌 Grouped bar chart showing gender preferences across products")
             
-            cross_tab = pd.crosstab(df['Product'], df['Gender'])
-            fig = go.Figure(data=[
-                go.Bar(name='Female', x=cross_tab.index, y=cross_tab['Female'], marker_color='#ec4899'),
-                go.Bar(name='Male', x=cross_tab.index, y=cross_tab['Male'], marker_color='#8b5cf6')
-            ])
-            fig.update_layout(
-                barmode='group',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1'),
-                xaxis=dict(showgrid=False),
-                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
-                height=350
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            cross_tab = summary.crosstab('Gender')
+            def build_figure():
+                fig = go.Figure(data=[
+                    go.Bar(name='Female', x=cross_tab.index, y=cross_tab['Female'], marker_color='#ec4899'),
+                    go.Bar(name='Male', x=cross_tab.index, y=cross_tab['Male'], marker_color='#8b5cf6')
+                ])
+                fig.update_layout(
+                    barmode='group',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#cbd5e1'),
+                    xaxis=dict(showgrid=False),
+                    yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
+                    height=350
+                )
+                return fig
+            show_chart("eda_product_gender", build_figure)
             
             st.success("""
             **Gender Pattern:** KP281 shows balanced gender appeal, KP481 leans female, 
@@ -641,23 +800,17 @@ with tabs[1]:
             st.markdown("**Income vs Product**")
             st.caption("📌 Violin plot displaying income distribution for each product")
             
-            fig = go.Figure()
-            for product in df['Product'].unique():
-                product_data = df[df['Product'] == product]
-                fig.add_trace(go.Violin(
-                    y=product_data['Income'],
-                    name=product,
-                    box_visible=True,
-                    meanline_visible=True
-                ))
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1'),
-                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title='Income'),
-                height=350
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            def build_figure():
+                fig = charts.violin_figure(distribution_view(), 'Income')
+                fig.update_layout(
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#cbd5e1'),
+                    yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title='Income'),
+                    height=350
+                )
+                return fig
+            show_chart("eda_income_violin", build_figure)
             
             st.success("""
             **Income Correlation:** Clear income stratification exists across products. 
@@ -678,153 +831,165 @@ with tabs[1]:
             </p>
         </div>
         """, unsafe_allow_html=True)
-        fig = px.scatter(df, x='Income', y='Miles', color='Product', size='Usage',
-                        hover_data=['Gender', 'Age', 'Fitness_category'],
-                        color_discrete_sequence=['#667eea', '#f093fb', '#11998e'])
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            xaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
-            yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
-            height=500
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def build_figure():
+            fig = charts.income_miles_figure(df)
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                xaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
+                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
+                height=500
+            )
+            return fig
+        show_chart("eda_income_miles", build_figure)
     
-    with viz_tabs[2]:
+    if viz_section == "🎨 Multivariate":
         st.subheader("Multivariate Analysis")
         
         # Interactive Correlation Heatmap
         st.markdown("**🔥 Correlation Heatmap**")
-        numeric_df = df.select_dtypes(include=[np.number])
-        corr = numeric_df.corr()
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=corr.values,
-            x=corr.columns,
-            y=corr.columns,
-            colorscale='RdBu',
-            zmid=0,
-            text=corr.values.round(2),
-            texttemplate='%{text}',
-            textfont={"size": 10},
-            colorbar=dict(title="Correlation")
-        ))
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            height=600
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def build_figure():
+            corr = summary.covariance.corr()
+            fig = go.Figure(data=go.Heatmap(
+                z=corr.values,
+                x=corr.columns,
+                y=corr.columns,
+                colorscale='RdBu',
+                zmid=0,
+                text=corr.values.round(2),
+                texttemplate='%{text}',
+                textfont={"size": 10},
+                colorbar=dict(title="Correlation")
+            ))
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                height=600
+            )
+            return fig
+        show_chart("eda_correlation", build_figure)
         
-        st.info("""
+        strongest = "\n".join(
+            f"- **{column_label(a)} & {column_label(b)}**: {r:.2f} ({correlation_strength(r)})"
+            for (a, b), r in summary.covariance.strongest().items()
+        )
+        st.info(f"""
         **🔍 Key Correlations:**
-        - **Fitness & Miles**: 0.79 (Strong positive)
-        - **Product Price & Income**: 0.70 (Strong positive)
-        - **Usage & Miles**: 0.76 (Strong positive)
+{strongest}
         """)
         
         # 3D Scatter
         st.markdown("**🎯 3D Feature Space**")
-        fig = px.scatter_3d(df, x='Income', y='Miles', z='Age', color='Product',
-                           size='Usage', hover_data=['Gender', 'Fitness_category'],
-                           color_discrete_sequence=['#667eea', '#f093fb', '#11998e'])
-        fig.update_layout(
-            scene=dict(
-                bgcolor='rgba(0,0,0,0)',
-                xaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(139, 92, 246, 0.2)'),
-                yaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(139, 92, 246, 0.2)'),
-                zaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(139, 92, 246, 0.2)')
-            ),
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            height=600
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def build_figure():
+            fig = charts.feature_space_3d_figure(df)
+            fig.update_layout(
+                scene=dict(
+                    bgcolor='rgba(0,0,0,0)',
+                    xaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(139, 92, 246, 0.2)'),
+                    yaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(139, 92, 246, 0.2)'),
+                    zaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(139, 92, 246, 0.2)')
+                ),
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                height=600
+            )
+            return fig
+        show_chart("eda_feature_space_3d", build_figure)
     
-    with viz_tabs[3]:
+    if viz_section == "⚠️ Outliers":
         st.subheader("Outlier Detection")
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("**Miles Outliers**")
-            fig = go.Figure()
-            fig.add_trace(go.Box(y=df['Miles'], name='Miles', marker_color='#8b5cf6', boxmean='sd'))
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1'),
-                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
-                height=400
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            def build_figure():
+                stats = distribution_view(by=None).rename(index={distributions.OVERALL: 'Miles'})
+                fig = charts.box_figure(stats, 'Miles', colors=['#8b5cf6'])
+                fig.update_layout(
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#cbd5e1'),
+                    yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
+                    height=400
+                )
+                return fig
+            show_chart("outliers_miles", build_figure)
         
         with col2:
             st.markdown("**Income Outliers**")
-            fig = go.Figure()
-            fig.add_trace(go.Box(y=df['Income'], name='Income', marker_color='#ec4899', boxmean='sd'))
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1'),
-                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
-                height=400
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            def build_figure():
+                stats = distribution_view(by=None).rename(index={distributions.OVERALL: 'Income'})
+                fig = charts.box_figure(stats, 'Income', colors=['#ec4899'])
+                fig.update_layout(
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#cbd5e1'),
+                    yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)'),
+                    height=400
+                )
+                return fig
+            show_chart("outliers_income", build_figure)
         
         st.info("⚠️ High income and high miles outliers are largely associated with the **KP781** product.")
 
 # TAB 3: Probability Analysis
-with tabs[2]:
+def render_probability_analysis():
+    kpi = kpi_values(summary, data_version)
     st.header("🎲 Probability & Contingency Analysis")
-    logger.info("Probability Analysis tab accessed")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("### 📊 Marginal Probabilities")
-        prob_product = df["Product"].value_counts(normalize=True).mul(100).round(2)
-        
-        fig = go.Figure(data=[go.Bar(
-            x=prob_product.index,
-            y=prob_product.values,
-            marker=dict(color=['#667eea', '#f093fb', '#11998e']),
-            text=[f'{v:.1f}%' for v in prob_product.values],
-            textposition='outside'
-        )])
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            xaxis=dict(showgrid=False, title='Product'),
-            yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title='Probability (%)'),
-            height=350
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        st.caption("✅ KP281 is the most popular product (44.4%)")
+        prob_product = summary.product_counts.div(summary.n_rows).mul(100).round(2)
+        
+        def build_figure():
+            fig = go.Figure(data=[go.Bar(
+                x=prob_product.index,
+                y=prob_product.values,
+                marker=dict(color=['#667eea', '#f093fb', '#11998e']),
+                text=[f'{v:.1f}%' for v in prob_product.values],
+                textposition='outside'
+            )])
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                xaxis=dict(showgrid=False, title='Product'),
+                yaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title='Probability (%)'),
+                height=350
+            )
+            return fig
+        show_chart("prob_product", build_figure)
+        leader, leader_share = kpi["market_leader"]
+        st.caption(f"✅ {leader} is the most popular product ({leader_share:.1f}%)")
     
     with col2:
         st.markdown("### 👥 Gender Probability")
-        prob_gender = df["Gender"].value_counts(normalize=True).mul(100).round(2)
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=prob_gender.index,
-            values=prob_gender.values,
-            hole=0.4,
-            marker=dict(colors=['#8b5cf6', '#ec4899']),
-            textinfo='label+percent'
-        )])
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            height=350,
-            showlegend=True
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        st.caption("👨 Male customers (57.8%) > Female (42.2%)")
+        prob_gender = summary.gender_counts.div(summary.n_rows).mul(100).round(2)
+        
+        def build_figure():
+            fig = go.Figure(data=[go.Pie(
+                labels=prob_gender.index,
+                values=prob_gender.values,
+                hole=0.4,
+                marker=dict(colors=['#8b5cf6', '#ec4899']),
+                textinfo='label+percent'
+            )])
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                height=350,
+                showlegend=True
+            )
+            return fig
+        show_chart("prob_gender", build_figure)
+        gender_share = kpi["gender_share"].sort_values(ascending=False)
+        st.caption("👥 " + " > ".join(f"{gender} ({share:.1f}%)" for gender, share in gender_share.items()))
     
     st.markdown("---")
     
@@ -835,77 +1000,86 @@ with tabs[2]:
     
     with prob_tabs[0]:
         st.markdown("**Product vs Gender**")
-        cond_prob = pd.crosstab(df["Product"], df["Gender"], margins=True, normalize='columns').mul(100).round(2)
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=cond_prob.iloc[:-1, :-1].values,
-            x=cond_prob.columns[:-1],
-            y=cond_prob.index[:-1],
-            colorscale='Purples',
-            text=cond_prob.iloc[:-1, :-1].values,
-            texttemplate='%{text:.1f}%',
-            textfont={"size": 14},
-            colorbar=dict(title="Probability (%)")
-        ))
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        st.success("✨ **KP781** is heavily skewed towards male customers (31.7% of males vs 9.2% of females)")
+        cond_prob = summary.crosstab("Gender", normalize='columns')
+        
+        def build_figure():
+            fig = go.Figure(data=go.Heatmap(
+                z=cond_prob.values,
+                x=cond_prob.columns,
+                y=cond_prob.index,
+                colorscale='Purples',
+                text=cond_prob.values,
+                texttemplate='%{text:.1f}%',
+                textfont={"size": 14},
+                colorbar=dict(title="Probability (%)")
+            ))
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                height=400
+            )
+            return fig
+        show_chart("prob_product_gender", build_figure)
+        premium, male_share = kpi["male_premium"]
+        female_share = kpi["product_by_gender"]["Female"].get(premium, 0.0)
+        st.success(f"✨ **{premium}** is bought by {male_share:.1f}% of males vs {female_share:.1f}% of females")
     
     with prob_tabs[1]:
         st.markdown("**Product vs Age Category**")
-        cond_prob_age = pd.crosstab(df["Product"], df["Age_category"], margins=True, normalize='columns').mul(100).round(2)
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=cond_prob_age.iloc[:-1, :-1].values,
-            x=cond_prob_age.columns[:-1],
-            y=cond_prob_age.index[:-1],
-            colorscale='Blues',
-            text=cond_prob_age.iloc[:-1, :-1].values,
-            texttemplate='%{text:.1f}%',
-            textfont={"size": 12},
-            colorbar=dict(title="Probability (%)")
-        ))
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        st.info("🎯 Teens (0-21) strongly prefer **KP281** (58.8%)")
+        cond_prob_age = summary.crosstab("Age_category", normalize='columns')
+        
+        def build_figure():
+            fig = go.Figure(data=go.Heatmap(
+                z=cond_prob_age.values,
+                x=cond_prob_age.columns,
+                y=cond_prob_age.index,
+                colorscale='Blues',
+                text=cond_prob_age.values,
+                texttemplate='%{text:.1f}%',
+                textfont={"size": 12},
+                colorbar=dict(title="Probability (%)")
+            ))
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                height=400
+            )
+            return fig
+        show_chart("prob_product_age", build_figure)
+        teen_choice, teen_share, _ = kpi["teen_preference"]
+        st.info(f"🎯 Teens (0-21) most often choose **{teen_choice}** ({teen_share:.1f}%)")
     
     with prob_tabs[2]:
         st.markdown("**Product vs Fitness Category**")
-        cond_prob_fitness = pd.crosstab(df["Product"], df["Fitness_category"], margins=True, normalize='columns').mul(100).round(2)
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=cond_prob_fitness.iloc[:-1, :-1].values,
-            x=cond_prob_fitness.columns[:-1],
-            y=cond_prob_fitness.index[:-1],
-            colorscale='Greens',
-            text=cond_prob_fitness.iloc[:-1, :-1].values,
-            texttemplate='%{text:.1f}%',
-            textfont={"size": 10},
-            colorbar=dict(title="Probability (%)")
-        ))
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1'),
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        st.success("💪 **93.5%** of 'Excellent Shape' customers buy **KP781**")
+        cond_prob_fitness = summary.crosstab("Fitness_category", normalize='columns')
+        
+        def build_figure():
+            fig = go.Figure(data=go.Heatmap(
+                z=cond_prob_fitness.values,
+                x=cond_prob_fitness.columns,
+                y=cond_prob_fitness.index,
+                colorscale='Greens',
+                text=cond_prob_fitness.values,
+                texttemplate='%{text:.1f}%',
+                textfont={"size": 10},
+                colorbar=dict(title="Probability (%)")
+            ))
+            fig.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#cbd5e1'),
+                height=400
+            )
+            return fig
+        show_chart("prob_product_fitness", build_figure)
+        elite_choice, elite_share = kpi["fitness_elite"]
+        st.success(f"💪 **{elite_share:.1f}%** of '{kpis.TOP_FITNESS}' customers buy **{elite_choice}**")
 
 # TAB 4: Insights & Recommendations
-with tabs[3]:
+def render_insights():
     st.header("💡 Business Insights & Recommendations")
-    logger.info("Insights & Recommendations tab accessed")
     
     # Customer Profiles
     col1, col2, col3 = st.columns(3)
@@ -999,23 +1173,41 @@ with tabs[3]:
     # Key Metrics Summary
     st.subheader("📈 Key Performance Indicators")
     
+    kpi = kpi_values(summary, data_version)
     kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns(5)
     
     with kpi1:
-        st.metric("Market Leader", "KP281", "44.4%", help="Highest selling product")
+        st.metric("Market Leader", kpi["market_leader"][0], f"{kpi['market_leader'][1]:.1f}%", help="Highest selling product")
     with kpi2:
-        st.metric("Female Preference", "KP281", "52.6%", help="Female customers prefer KP281")
+        st.metric("Female Preference", kpi["female_preference"][0], f"{kpi['female_preference'][1]:.1f}%", help="Most bought product among female customers")
     with kpi3:
-        st.metric("Male Premium", "KP781", "31.7%", help="Male customers prefer premium")
+        st.metric("Male Premium", kpi["male_premium"][0], f"{kpi['male_premium'][1]:.1f}%", help="Share of male customers buying the premium model")
     with kpi4:
-        st.metric("Fitness Elite", "KP781", "93.5%", help="Excellent shape → KP781")
+        st.metric("Fitness Elite", kpi["fitness_elite"][0], f"{kpi['fitness_elite'][1]:.1f}%", help=f"Most bought product in {kpis.TOP_FITNESS}")
     with kpi5:
-        st.metric("Avg Revenue", f"${df.groupby('Product')['Product_price'].sum().mean():,.0f}", "Per Product")
+        st.metric("Avg Revenue", f"${kpi['avg_revenue']:,.0f}", "Per Product")
 
 # TAB 5: Complete Analysis
-with tabs[4]:
+def render_complete_analysis():
     st.header("📚 Complete Analysis")
-    logger.info("Complete Analysis tab accessed")
+    kpi = kpi_values(summary, data_version)
+    by_gender = kpi["product_by_gender"]
+    share = kpi["product_share"]
+    age_mix = kpi["age_mix"]
+    miles_range = kpi["miles_range"]
+    miles_fence, miles_outliers = kpi["outliers"]["Miles"]
+    income_fence, income_outliers = kpi["outliers"]["Income"]
+
+    def age_distribution(product):
+        if product not in age_mix.index:
+            return "n/a"
+        return ", ".join(f"{count:,} {label.split(' (')[0]}" for label, count in age_mix.loc[product].items())
+
+    def miles_band(product):
+        if product not in miles_range.index:
+            return "n/a"
+        low, high = miles_range.loc[product]
+        return f"{low:.0f}-{high:.0f} miles per week (middle 50%)"
     
     st.info("This section contains the comprehensive analysis from the Jupyter Notebook, including all findings, methodologies, and detailed insights.")
     
@@ -1082,8 +1274,8 @@ with tabs[4]:
     # Sub-tab 2: Data Dictionary
     with analysis_tabs[1]:
         st.markdown("### 📊 Dataset Overview")
-        st.metric("Total Records", len(df), "Customers")
-        st.metric("Features", df.shape[1], "Columns")
+        st.metric("Total Records", summary.n_rows, "Customers")
+        st.metric("Features", len(data_loader.column_names()), "Columns")
         
         st.markdown("### 📋 Feature Descriptions")
         
@@ -1107,16 +1299,16 @@ with tabs[4]:
             """, unsafe_allow_html=True)
         
         st.markdown("### 📈 Summary Statistics")
-        st.dataframe(df.describe(), use_container_width=True)
+        st.dataframe(describe_data(df, data_version), use_container_width=True)
     
     # Sub-tab 3: Analysis Steps
     with analysis_tabs[2]:
         st.markdown("### 🔬 Methodology")
         
         steps = [
-            {"num": "1", "title": "Data Preprocessing", "desc": "Created Fitness_category, Age_category, and Product_price features", "color": "#667eea"},
+            {"num": "1", "title": "Data Preprocessing", "desc": "Created Fitness_category, Age_category, Income_band and Product_price features", "color": "#667eea"},
             {"num": "2", "title": "Exploratory Data Analysis", "desc": "Analyzed distributions, correlations, and relationships", "color": "#f472b6"},
-            {"num": "3", "title": "Outlier Detection", "desc": "Identified 13 outliers in Miles (>187.875) and 19 in Income (>$80,581)", "color": "#11998e"},
+            {"num": "3", "title": "Outlier Detection", "desc": f"Identified {miles_outliers:,} outliers in Miles (>{miles_fence:,.1f}) and {income_outliers:,} in Income (>${income_fence:,.0f})", "color": "#11998e"},
             {"num": "4", "title": "Probability Analysis", "desc": "Computed marginal and conditional probabilities across demographics", "color": "#fa709a"},
             {"num": "5", "title": "Customer Profiling", "desc": "Created detailed profiles for each product's target audience", "color": "#fee140"}
         ]
@@ -1141,21 +1333,29 @@ with tabs[4]:
             """, unsafe_allow_html=True)
         
         st.markdown("### 🔍 Key Correlations Found")
-        st.success("""
-        - **Fitness & Miles**: 0.79 - Strong positive correlation
-        - **Product Price & Income**: 0.70 - Higher income → Premium products
-        - **Usage & Miles**: 0.76 - More frequent use → More miles
+        corr = summary.covariance.corr()
+        st.success(f"""
+        - **Fitness & Miles**: {corr.loc['Fitness', 'Miles']:.2f} - {correlation_strength(corr.loc['Fitness', 'Miles'])} correlation
+        - **Product Price & Income**: {corr.loc['Product_price', 'Income']:.2f} - Higher income → Premium products
+        - **Usage & Miles**: {corr.loc['Usage', 'Miles']:.2f} - More frequent use → More miles
         """)
     
     # Sub-tab 4: Key Findings
     with analysis_tabs[3]:
         st.markdown("### 📊 Probability Insights")
         
+        female_choice, female_share = kpi["female_preference"]
+        premium, male_premium_share = kpi["male_premium"]
+        teen_choice, teen_share, teen_premium = kpi["teen_preference"]
+        elite_choice, elite_share = kpi["fitness_elite"]
+        teen_premium_text = f"none buy {premium}" if teen_premium == 0 else f"{teen_premium:.1f}% buy {premium}"
         findings = [
-            {"title": "Gender Preferences", "stat": "52.6%", "desc": "of female customers buy KP281 vs 38.5% of males"},
-            {"title": "Male Premium Preference", "stat": "31.7%", "desc": "of male customers buy KP781 vs only 9.2% of females"},
-            {"title": "Age Factor", "stat": "58.8%", "desc": "of teens (0-21) prefer KP281, none buy KP781"},
-            {"title": "Fitness Correlation", "stat": "93.5%", "desc": "of customers in Excellent Shape buy KP781"}
+            {"title": "Gender Preferences", "stat": f"{female_share:.1f}%",
+             "desc": f"of female customers buy {female_choice} vs {by_gender['Male'].get(female_choice, 0.0):.1f}% of males"},
+            {"title": "Male Premium Preference", "stat": f"{male_premium_share:.1f}%",
+             "desc": f"of male customers buy {premium} vs only {by_gender['Female'].get(premium, 0.0):.1f}% of females"},
+            {"title": "Age Factor", "stat": f"{teen_share:.1f}%", "desc": f"of teens (0-21) prefer {teen_choice}, {teen_premium_text}"},
+            {"title": "Fitness Correlation", "stat": f"{elite_share:.1f}%", "desc": f"of customers in {kpis.TOP_FITNESS} buy {elite_choice}"}
         ]
         
         cols = st.columns(2)
@@ -1174,31 +1374,30 @@ with tabs[4]:
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("**Average Miles by Product**")
-            avg_miles_product = df.groupby('Product')['Miles'].mean().round(1)
+            avg_miles_product = summary.mean('Miles', by='Product').round(1)
             for product, miles in avg_miles_product.items():
                 st.metric(product, f"{miles} miles/week")
         
         with col2:
-            st.markdown("**Miles Range by Product**")
-            st.write("- **KP281**: 70-90 miles/week")
-            st.write("- **KP481**: 70-130 miles/week")
-            st.write("- **KP781**: 120-200+ miles/week")
+            st.markdown("**Miles Range by Product** (middle 50%)")
+            for product, (low, high) in kpi["miles_range"].iterrows():
+                st.write(f"- **{product}**: {low:.0f}-{high:.0f} miles/week")
     
     # Sub-tab 5: Customer Profiles
     with analysis_tabs[4]:
         st.markdown("### 👥 Detailed Customer Profiling")
         
         st.markdown("#### 🥉 KP281 - Entry Level")
-        st.markdown("""
+        st.markdown(f"""
         <div style='background: linear-gradient(135deg, #667eea22 0%, #764ba211 100%); 
                     padding: 1.5rem; border-radius: 15px; margin-bottom: 1.5rem;
                     border-left: 5px solid #667eea;'>
             <ul style='color: #cbd5e1; margin: 0;'>
-                <li><strong>Market Share:</strong> 44.4% (Highest selling product)</li>
+                <li><strong>Market Share:</strong> {share.get('KP281', 0.0):.1f}%</li>
                 <li><strong>Gender Split:</strong> Equal appeal to both genders</li>
-                <li><strong>Age Distribution:</strong> 56 Adults, 10 Teens, 11 Mid-age, 3 Old-age</li>
+                <li><strong>Age Distribution:</strong> {age_distribution('KP281')}</li>
                 <li><strong>Usage:</strong> 3-4 times per week</li>
-                <li><strong>Miles:</strong> 70-90 miles per week average</li>
+                <li><strong>Miles:</strong> {miles_band('KP281')}</li>
                 <li><strong>Fitness Level:</strong> Average Shape</li>
                 <li><strong>Income:</strong> < $60,000</li>
                 <li><strong>Target:</strong> General purpose for all age groups and fitness levels</li>
@@ -1207,16 +1406,16 @@ with tabs[4]:
         """, unsafe_allow_html=True)
         
         st.markdown("#### 🥈 KP481 - Mid Level")
-        st.markdown("""
+        st.markdown(f"""
         <div style='background: linear-gradient(135deg, #f093fb22 0%, #f5576c11 100%); 
                     padding: 1.5rem; border-radius: 15px; margin-bottom: 1.5rem;
                     border-left: 5px solid #f093fb;'>
             <ul style='color: #cbd5e1; margin: 0;'>
-                <li><strong>Market Share:</strong> 33.3%</li>
-                <li><strong>Gender Preference:</strong> Strong female appeal (38.15% vs 29.80% male)</li>
-                <li><strong>Age Distribution:</strong> 45 Adults, 7 Teens, 7 Mid-age, 1 Old-age</li>
+                <li><strong>Market Share:</strong> {share.get('KP481', 0.0):.1f}%</li>
+                <li><strong>Gender Preference:</strong> Female appeal ({by_gender['Female'].get('KP481', 0.0):.2f}% vs {by_gender['Male'].get('KP481', 0.0):.2f}% male)</li>
+                <li><strong>Age Distribution:</strong> {age_distribution('KP481')}</li>
                 <li><strong>Usage:</strong> 3-4 times per week (less frequent but more miles)</li>
-                <li><strong>Miles:</strong> 70-130+ miles per week</li>
+                <li><strong>Miles:</strong> {miles_band('KP481')}</li>
                 <li><strong>Fitness Level:</strong> Bad to Average Shape</li>
                 <li><strong>Income:</strong> $50,000 - $70,000</li>
                 <li><strong>Recommendation:</strong> Specifically for female intermediate users</li>
@@ -1225,17 +1424,17 @@ with tabs[4]:
         """, unsafe_allow_html=True)
         
         st.markdown("#### 🥇 KP781 - Advanced")
-        st.markdown("""
+        st.markdown(f"""
         <div style='background: linear-gradient(135deg, #11998e22 0%, #38ef7d11 100%); 
                     padding: 1.5rem; border-radius: 15px; margin-bottom: 1.5rem;
                     border-left: 5px solid #11998e;'>
             <ul style='color: #cbd5e1; margin: 0;'>
-                <li><strong>Market Share:</strong> 22.2% (Least sold but highest revenue per unit)</li>
-                <li><strong>Gender Skew:</strong> Predominantly male (31.73% vs 9.21% female)</li>
-                <li><strong>Age Distribution:</strong> 34 Adults, 0 Teens, 4 Mid-age, 2 Old-age</li>
+                <li><strong>Market Share:</strong> {share.get('KP781', 0.0):.1f}% (highest revenue per unit)</li>
+                <li><strong>Gender Skew:</strong> {by_gender['Male'].get('KP781', 0.0):.2f}% of males vs {by_gender['Female'].get('KP781', 0.0):.2f}% of females</li>
+                <li><strong>Age Distribution:</strong> {age_distribution('KP781')}</li>
                 <li><strong>Usage:</strong> 4-5+ times per week (extensive use)</li>
-                <li><strong>Miles:</strong> 120-200+ miles per week</li>
-                <li><strong>Fitness Level:</strong> Excellent Shape (93.5% probability)</li>
+                <li><strong>Miles:</strong> {miles_band('KP781')}</li>
+                <li><strong>Fitness Level:</strong> {kpis.TOP_FITNESS} ({kpi['product_by_fitness'].get('KP781', 0.0):.1f}% of that level buy KP781)</li>
                 <li><strong>Income:</strong> > $80,000 (high-income earners)</li>
                 <li><strong>Marital Status:</strong> Slightly higher among single customers</li>
                 <li><strong>Target:</strong> Athletes and serious fitness enthusiasts</li>
@@ -1331,10 +1530,18 @@ with tabs[4]:
             </div>
             """, unsafe_allow_html=True)
 
+# Log index shared by all sessions; each refresh only reads newly appended bytes
+@st.cache_resource
+def get_log_index():
+    return app_logging.LogIndex(app_logging.LOG_FILE)
+
+def read_full_log():
+    with open(app_logging.LOG_FILE, "rb") as f:
+        return f.read()
+
 # TAB 6: Logs
-with tabs[5]:
+def render_logs():
     st.header("📝 Application Logs")
-    logger.info("Logs tab accessed")
     
     st.markdown("""
     <div style='background: rgba(139, 92, 246, 0.1); padding: 1rem; border-radius: 10px; border-left: 4px solid #8b5cf6; margin-bottom: 1rem;'>
@@ -1352,11 +1559,12 @@ with tabs[5]:
         log_filter = st.selectbox(
             "Filter by Level",
             ["All", "INFO", "WARNING", "ERROR"],
-            help="Filter logs by severity level"
+            help="Filter logs by severity level",
+            key="log_level"
         )
     
     with col2:
-        search_term = st.text_input("🔍 Search logs", placeholder="Enter search term...")
+        search_term = st.text_input("🔍 Search logs", placeholder="Enter search term...", key="log_search")
     
     with col3:
         auto_refresh = st.checkbox("Auto-refresh", value=False)
@@ -1365,27 +1573,20 @@ with tabs[5]:
     
     # Read and display logs
     try:
-        with open("app.log", "r") as f:
-            log_content = f.readlines()
-        
-        # Filter logs
-        filtered_logs = []
-        for line in log_content:
-            # Apply level filter
-            if log_filter != "All" and log_filter not in line:
-                continue
-            # Apply search filter
-            if search_term and search_term.lower() not in line.lower():
-                continue
-            filtered_logs.append(line)
+        log_index = get_log_index()
+        log_index.refresh()
+        
+        # Filter logs through the index
+        filtered_logs = log_index.search(level=None if log_filter == "All" else log_filter, text=search_term)
         
         # Display statistics
         col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
         
-        total_logs = len(log_content)
-        info_count = sum(1 for line in log_content if "INFO" in line)
-        warning_count = sum(1 for line in log_content if "WARNING" in line)
-        error_count = sum(1 for line in log_content if "ERROR" in line)
+        level_counts = log_index.counts
+        total_logs = len(log_index)
+        info_count = level_counts["INFO"]
+        warning_count = level_counts["WARNING"]
+        error_count = level_counts["ERROR"]
         
         with col_stat1:
             st.metric("Total Logs", total_logs, help="Total number of log entries")
@@ -1403,36 +1604,35 @@ with tabs[5]:
             st.markdown(f"**Showing {len(filtered_logs)} of {total_logs} log entries**")
             
             # Create a styled log display
-            log_display = ""
-            for line in reversed(filtered_logs[-100:]):  # Show last 100 filtered logs
-                line = line.strip()
-                if "ERROR" in line:
+            log_display = []
+            for record in reversed(log_index.read(filtered_logs[-100:])):  # Show last 100 filtered logs
+                line = html.escape(f"{record['time']} - {record['level']} - {record['message']}")
+                if record["level"] == "ERROR":
                     color = "#f87171"  # Red
                     icon = "❌"
-                elif "WARNING" in line:
+                elif record["level"] == "WARNING":
                     color = "#fbbf24"  # Yellow
                     icon = "⚠️"
-                elif "INFO" in line:
+                elif record["level"] == "INFO":
                     color = "#60a5fa"  # Blue
                     icon = "ℹ️"
                 else:
                     color = "#cbd5e1"  # Gray
                     icon = "📝"
                 
-                log_display += f"""
+                log_display.append(f"""
                 <div style='background: rgba(139, 92, 246, 0.05); padding: 0.75rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 3px solid {color}; font-family: monospace; font-size: 0.85rem;'>
                     <span style='color: {color};'>{icon}</span> <span style='color: #cbd5e1;'>{line}</span>
                 </div>
-                """
+                """)
             
-            st.markdown(log_display, unsafe_allow_html=True)
+            st.markdown("".join(log_display), unsafe_allow_html=True)
             
             # Download logs button
             st.markdown("---")
-            log_text = "".join(log_content)
             st.download_button(
                 label="📥 Download Full Logs",
-                data=log_text,
+                data=read_full_log,
                 file_name=f"aerofit_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
                 mime="text/plain",
                 help="Download complete log file"
@@ -1444,6 +1644,26 @@ with tabs[5]:
         st.warning("📝 No log file found yet. Logs will be created as you interact with the application.")
         logger.info("Log file not found - creating new log")
     
+    # Figure cache effectiveness
+    with st.expander("🧮 Figure Cache"):
+        cache_stats = get_figure_cache().stats()
+        fc1, fc2, fc3, fc4 = st.columns(4)
+        with fc1:
+            st.metric("Hits", f"{cache_stats['hits']:,}", f"{cache_stats['hit_rate']:.0%} hit rate", delta_color="off")
+        with fc2:
+            st.metric("Misses", f"{cache_stats['misses']:,}", help="Figures built from scratch")
+        with fc3:
+            st.metric("Cached Figures", cache_stats["entries"], f"{cache_stats['evictions']} evicted", delta_color="off")
+        with fc4:
+            st.metric("Cache Size", f"{cache_stats['bytes'] / 1e6:.1f} MB", f"of {charts.FIGURE_CACHE_MB} MB", delta_color="off")
+    
+    # Derived columns are computed on first use; show which ones exist and their footprint
+    with st.expander("🧱 Derived Columns"):
+        computed = data_loader.computed_columns(df)
+        for name, size in data_loader.derived_memory(df).items():
+            status = "not computed yet" if size is None else f"{size / 1024:,.1f} KB ({size / max(len(df), 1):.1f} bytes/row)"
+            st.markdown(f"- **{name}** ({computed[name].dtype if size is not None else 'lazy'}): {status}")
+    
     # Add some helpful information
     with st.expander("ℹ️ About Logs"):
         st.markdown("""
@@ -1460,9 +1680,93 @@ with tabs[5]:
         - Any errors or exceptions
         
         ### Log File Location
-        The log file is stored as `app.log` in the application directory.
+        The log file is stored as `app.log` in the application directory, one JSON object
+        per line. It rotates at 10 MB and the five most recent files are kept (`app.log.1` … `app.log.5`).
         """)
 
+# TAB 7: Performance
+def render_performance():
+    st.header("⚡ Performance")
+    st.caption(f"Recent reruns of all sessions (up to {profiling.RECENT_RUNS}); this rerun is added when it finishes.")
+    
+    runs = profiling.renders.runs()
+    if runs.empty:
+        st.info("No reruns recorded yet. Interact with the dashboard and come back.")
+        return
+    
+    p1, p2, p3, p4 = st.columns(4)
+    with p1:
+        st.metric("Reruns", f"{len(runs):,}", f"{runs['session'].nunique()} sessions", delta_color="off")
+    with p2:
+        st.metric("Rerun p50", f"{runs['seconds'].median() * 1000:,.0f} ms")
+    with p3:
+        st.metric("Rerun p95", f"{runs['seconds'].quantile(0.95) * 1000:,.0f} ms")
+    with p4:
+        st.metric("Payload p50", f"{runs['bytes'].median() / 1024:,.0f} KB", "per rerun", delta_color="off")
+    
+    st.markdown("---")
+    st.subheader("🐢 Slowest Sections, Charts and Data Steps")
+    st.session_state.setdefault("perf_kinds", ["section", "chart", "data", "table"])
+    kinds = st.multiselect("Show", ["section", "chart", "data", "table"], key="perf_kinds")
+    spans = profiling.renders.spans()
+    spans = spans[spans["kind"].isin(kinds)]
+    st.dataframe(
+        spans.assign(kb=spans["bytes"] / 1024).drop(columns="bytes"),
+        use_container_width=True, hide_index=True,
+        column_config={
+            "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.1f"),
+            "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.1f"),
+            "max_ms": st.column_config.NumberColumn("max (ms)", format="%.1f"),
+            "rows": st.column_config.NumberColumn("rows", format="%d"),
+            "kb": st.column_config.NumberColumn("payload (KB)", format="%.1f"),
+        },
+    )
+    
+    st.subheader("📦 Chart Payloads")
+    st.caption("Cached figures as sent (typed binary arrays) vs. the same figures with every data array as a JSON number list.")
+    payloads = get_figure_cache().payloads()
+    if not payloads.empty:
+        total_list, total_binary = payloads["list_bytes"].sum(), payloads["binary_bytes"].sum()
+        st.metric("All Cached Charts", f"{total_binary / 1024:,.1f} KB", f"{total_binary / total_list - 1:+.0%} vs JSON lists ({total_list / 1024:,.1f} KB)", delta_color="inverse")
+        st.dataframe(
+            payloads, use_container_width=True, hide_index=True,
+            column_config={
+                "list_bytes": st.column_config.NumberColumn("JSON lists (bytes)", format="%d"),
+                "binary_bytes": st.column_config.NumberColumn("typed arrays (bytes)", format="%d"),
+                "saved": st.column_config.NumberColumn("saved", format="percent"),
+            },
+        )
+    
+    st.subheader("👥 Per-Session Totals")
+    sessions = profiling.renders.sessions()
+    sessions["session"] = sessions["session"].where(
+        sessions["session"] != st.session_state["perf_session"], sessions["session"] + " (you)")
+    st.dataframe(
+        sessions.assign(avg_ms=sessions["seconds"] / sessions["reruns"] * 1000, mb=sessions["bytes"] / 1e6).drop(columns="bytes"),
+        use_container_width=True, hide_index=True,
+        column_config={
+            "seconds": st.column_config.NumberColumn("total (s)", format="%.2f"),
+            "avg_ms": st.column_config.NumberColumn("avg rerun (ms)", format="%.0f"),
+            "mb": st.column_config.NumberColumn("payload (MB)", format="%.2f"),
+        },
+    )
+
+SECTIONS = {
+    "📊 Data Overview": render_data_overview,
+    "🔍 Interactive EDA": render_interactive_eda,
+    "🎲 Probability Analysis": render_probability_analysis,
+    "💡 Insights & Recommendations": render_insights,
+    "📚 Complete Analysis": render_complete_analysis,
+    "📝 Logs": render_logs,
+    "⚡ Performance": render_performance,
+}
+section = section_selector(list(SECTIONS), key="section")
+if st.session_state.get("logged_section") != section:
+    st.session_state["logged_section"] = section
+    logger.info(f"{section[2:]} tab accessed")
+with profiling.profiler.phase("first render"), trace.span("section", section[2:]):
+    SECTIONS[section]()
+
 st.markdown("---")
 st.markdown("""
 <div style='text-align: center; padding: 2rem 0; color: #94a3b8;'>
@@ -1470,4 +1774,16 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-logger.info("Application render completed successfully")
+logger.debug("Application render completed successfully")
+profiling.renders.finish(trace)
+
+# Cold-start report (first script run of this server process)
+profiling.profiler.finish()
+if profiling.ENABLED:
+    with st.sidebar:
+        with st.expander("⏱️ Startup Profile", expanded=True):
+            total = profiling.profiler.total
+            st.metric("Cold Start", f"{total:.2f}s", f"budget {profiling.BUDGET_SECONDS:.1f}s",
+                      delta_color="off" if total <= profiling.BUDGET_SECONDS else "inverse")
+            for kind, name, seconds in profiling.profiler.report():
+                st.markdown(f"- {kind}: **{name}** — {seconds * 1000:.0f} ms")
@@ -0,0 +1,211 @@
+"""Process-wide logging for the dashboard.
+
+Streamlit re-executes ``app.py`` on every interaction, but imported modules
+persist, so ``setup_logging()`` installs the handlers only once per process.
+Records go through a queue to a background thread that writes them as JSON
+lines to a size-rotated ``app.log``; the render path never touches the disk.
+
+``LogIndex`` is the read side used by the Logs tab: it indexes the file
+incrementally from the last byte it read, so counts, searches and the "last
+100" view never rescan the whole log.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FILE = "app.log"
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+_LEGACY_LINE = re.compile(r"^(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (?P<level>[A-Z]+) - (?P<message>.*)$")
+
+_TERM = re.compile(r"\w+")
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL", "")
+_READ_BLOCK = 8 * 1024 * 1024
+
+_listener = None
+_lock = threading.Lock()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message (and exc)."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(path=LOG_FILE, level=logging.INFO):
+    """Route root logging through a queue to a rotating JSON-lines file.
+
+    Returns True the first time it runs in a process, False afterwards.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return False
+        records = queue.SimpleQueue()
+        file_handler = RotatingFileHandler(path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT,
+                                           encoding="utf-8", delay=True)
+        file_handler.setFormatter(JsonLinesFormatter())
+        _listener = QueueListener(records, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        root = logging.getLogger()
+        root.addHandler(QueueHandler(records))
+        root.setLevel(level)
+        return True
+
+
+def parse_line(line):
+    """Parse one log line into a dict with time, level and message.
+
+    Lines written before the JSON format (``time - LEVEL - message``) are still
+    understood; anything else is returned as a message with no level.
+    """
+    line = line.strip()
+    if line.startswith("{"):
+        try:
+            return json.loads(line)
+        except ValueError:
+            pass
+    match = _LEGACY_LINE.match(line)
+    if match:
+        return match.groupdict()
+    return {"time": "", "level": "", "message": line}
+
+
+class LogIndex:
+    """Incremental index over a JSON-lines log file.
+
+    Keeps the byte offset of every line, its level, per-level counts and an
+    inverted index from lower-cased words to line numbers. ``refresh()`` only
+    reads the bytes appended since the previous call and starts over when the
+    file was rotated or truncated.
+    """
+
+    def __init__(self, path=LOG_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, identity):
+        self._identity = identity
+        self._offset = 0
+        self._line_offsets = array("q")
+        self._level_lines = {level: array("I") for level in LEVELS}
+        self._terms = {}
+        self._sorted_terms = []
+
+    def __len__(self):
+        return len(self._line_offsets)
+
+    @property
+    def counts(self):
+        """Number of lines per level ("" for lines without one)."""
+        return {level: len(lines) for level, lines in self._level_lines.items()}
+
+    def refresh(self):
+        """Index lines appended since the last call; returns how many."""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset(None)
+                raise
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self._identity or stat.st_size < self._offset:
+                self._reset(identity)
+
+            added = 0
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                pending = b""
+                for block in iter(lambda: f.read(_READ_BLOCK), b""):
+                    pending += block
+                    # A partially written last line waits for the next block or refresh.
+                    complete = pending.rfind(b"\n") + 1
+                    for raw in pending[:complete].splitlines(keepends=True):
+                        self._add_line(self._offset, raw)
+                        self._offset += len(raw)
+                        added += 1
+                    pending = pending[complete:]
+            return added
+
+    def _add_line(self, position, raw):
+        record = parse_line(raw.decode("utf-8", errors="replace"))
+        level = record.get("level") if record.get("level") in self._level_lines else ""
+        number = len(self._line_offsets)
+        self._line_offsets.append(position)
+        self._level_lines[level].append(number)
+        for term in set(_TERM.findall(record.get("message", "").lower())):
+            postings = self._terms.get(term)
+            if postings is None:
+                postings = self._terms[term] = array("I")
+                insort(self._sorted_terms, term)
+            postings.append(number)
+
+    def search(self, level=None, text=""):
+        """Ascending line numbers matching a level and every word of ``text``.
+
+        A query word matches every indexed word that starts with it, found by
+        bisecting the sorted term list, so partial words still match. Text
+        without word characters (e.g. "->") is looked for as a substring of
+        each message instead. Without a search text the level's own line list
+        is returned as is.
+        """
+        needle = text.strip().lower()
+        words = _TERM.findall(needle)
+        with self._lock:
+            candidates = self._level_lines[level] if level else range(len(self._line_offsets))
+            if not needle:
+                return candidates
+            if words:
+                matches = None
+                for word in words:
+                    lines = set()
+                    for i in range(bisect_left(self._sorted_terms, word), len(self._sorted_terms)):
+                        term = self._sorted_terms[i]
+                        if not term.startswith(word):
+                            break
+                        lines.update(self._terms[term])
+                    matches = lines if matches is None else matches & lines
+                if level:
+                    matches &= set(self._level_lines[level])
+                return sorted(matches)
+            candidates = list(candidates)
+        records = self.read(candidates)
+        return [number for number, record in zip(candidates, records) if needle in record.get("message", "").lower()]
+
+    def read(self, line_numbers):
+        """Parsed records for the given line numbers, reading only their bytes."""
+        with self._lock:
+            spans = []
+            for number in line_numbers:
+                start = self._line_offsets[number]
+                stop = self._line_offsets[number + 1] if number + 1 < len(self._line_offsets) else self._offset
+                spans.append((start, stop))
+        records = []
+        with open(self.path, "rb") as f:
+            for start, stop in spans:
+                f.seek(start)
+                records.append(parse_line(f.read(stop - start).decode("utf-8", errors="replace")))
+        return records
@@ -0,0 +1,38 @@
+"""Correlation upkeep: folding appended rows into CovarianceState vs. DataFrame.corr().
+
+Usage: python -m benchmarks.bench_covariance [rows ...]
+
+The update cost should follow the size of the appended chunk; the rescan
+follows the total.
+"""
+import copy
+import sys
+
+import numpy as np
+import pandas as pd
+
+import aggregates
+import data_loader
+from benchmarks.bench_filters import resample, timed
+
+DEFAULT_ROWS = (1_000_000, 5_000_000, 20_000_000)
+DELTAS = (1_000, 100_000)
+
+
+def run(rows):
+    df = data_loader.add_derived_columns(resample(rows + max(DELTAS)))
+    columns = list(aggregates.CUBE_MEASURES)
+    base = df.iloc[:rows]
+    state = aggregates.CovarianceState.from_frame(base)
+    print(f"\n{rows:,} rows")
+    for delta in DELTAS:
+        chunk = df.iloc[rows:rows + delta]
+        update_ms, updated = timed(lambda: copy.deepcopy(state).update(chunk))
+        rescan_ms, expected = timed(lambda: pd.concat([base, chunk])[columns].corr())
+        assert np.allclose(updated.corr().to_numpy(), expected.to_numpy())
+        print(f"  append {delta:>9,} rows   update {update_ms:9.2f} ms   rescan {rescan_ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    for rows in [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROWS:
+        run(rows)
@@ -0,0 +1,70 @@
+"""Explorer filter latency: full boolean masks vs. the prebuilt FilterIndex.
+
+Usage: python -m benchmarks.bench_filters [rows ...]
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import indexes
+
+DEFAULT_ROWS = (1_000_000, 50_000_000)
+REPEATS = 5
+
+# (levels, ranges) combinations a user would typically set in the explorer.
+SCENARIOS = {
+    "defaults": ({"Product": ["KP281", "KP481", "KP781"], "Gender": ["Female", "Male"]}, {"Age": (18, 50)}),
+    "one product": ({"Product": ["KP781"]}, {}),
+    "product+gender+age": ({"Product": ["KP281", "KP481"], "Gender": ["Female"]}, {"Age": (25, 35)}),
+    "all dimensions": (
+        {"Product": ["KP481"], "Gender": ["Male"], "MaritalStatus": ["Single"], "Fitness": [3, 4]},
+        {"Age": (22, 40), "Income": (40_000, 70_000), "Usage": (3, 5)},
+    ),
+}
+
+
+def resample(rows, seed=0):
+    """The bundled export resampled to ``rows`` rows, column by column."""
+    base = data_loader.read_csv_typed(data_loader.DATA_FILE)
+    take = np.random.default_rng(seed).integers(0, len(base), rows)
+    return pd.DataFrame({column: base[column].take(take).reset_index(drop=True) for column in base.columns})
+
+
+def mask_filter(df, levels, ranges):
+    """What the explorer did before: one full-length mask per widget."""
+    mask = np.ones(len(df), dtype=bool)
+    for column, selected in levels.items():
+        mask &= df[column].isin(selected).to_numpy()
+    for column, (low, high) in ranges.items():
+        mask &= ((df[column] >= low) & (df[column] <= high)).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def timed(func):
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+def run(rows):
+    df = resample(rows)
+    start = time.perf_counter()
+    index = indexes.FilterIndex(df)
+    print(f"\n{rows:,} rows - index build {time.perf_counter() - start:.2f} s")
+    for name, (levels, ranges) in SCENARIOS.items():
+        mask_ms, expected = timed(lambda: mask_filter(df, levels, ranges))
+        index_ms, actual = timed(lambda: index.select(levels, ranges))
+        assert np.array_equal(expected, actual)
+        print(f"  {name:<20} masks {mask_ms:9.1f} ms   index {index_ms:9.1f} ms   ({len(actual):,} rows)")
+
+
+if __name__ == "__main__":
+    for rows in [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROWS:
+        run(rows)
@@ -0,0 +1,40 @@
+"""Summary build time vs. worker processes (parallel.summarize).
+
+Usage: python -m benchmarks.bench_parallel [rows ...]
+
+Each worker count gets one untimed call first so pool start-up is not
+counted; speedups are relative to the serial summarize_frame.
+"""
+import os
+import sys
+
+import aggregates
+import data_loader
+import parallel
+from benchmarks.bench_filters import resample, timed
+
+DEFAULT_ROWS = (2_000_000, 20_000_000)
+
+
+def worker_counts():
+    counts, workers = [], 2
+    while workers <= (os.cpu_count() or 1):
+        counts.append(workers)
+        workers *= 2
+    return counts or [2]
+
+
+def run(rows):
+    df = data_loader.add_derived_columns(resample(rows))
+    serial_ms, expected = timed(lambda: aggregates.summarize_frame(df))
+    print(f"\n{rows:,} rows, {os.cpu_count()} cores - serial {serial_ms:9.1f} ms")
+    for workers in worker_counts():
+        parallel.summarize(df, workers=workers, min_rows=0)
+        parallel_ms, summary = timed(lambda: parallel.summarize(df, workers=workers, min_rows=0))
+        assert summary.cube.counts(["Product", "Gender"]).equals(expected.cube.counts(["Product", "Gender"]))
+        print(f"  {workers:>3} workers {parallel_ms:9.1f} ms   speedup {serial_ms / parallel_ms:5.2f}x")
+
+
+if __name__ == "__main__":
+    for rows in [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROWS:
+        run(rows)
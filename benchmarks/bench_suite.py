@@ -0,0 +1,186 @@
+"""Pipeline and per-tab compute times on synthetic exports, kept as a history.
+
+Usage: python -m benchmarks.bench_suite [rows ...] [--repeats N] [--check]
+
+Each size gets a synthetic export (``benchmarks.synthetic``, cached under
+``benchmarks/data``). Every pipeline stage and the computation behind each tab
+is timed on it, taking the median of ``--repeats`` runs. Exports the dashboard
+would stream (see ``data_loader.use_streaming``) only get the stages the
+streaming path runs. Results are appended to ``benchmarks/results/history.jsonl``
+with the commit they were measured at, and compared with the last run of the
+same size and mode at another commit. Stages at least ``REGRESSION_RATIO``
+times (and ``REGRESSION_MIN_MS``) slower are flagged; ``--check`` exits
+non-zero if there are any.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import aggregates
+import data_loader
+import distributions
+import indexes
+import kpis
+import parallel
+from benchmarks import synthetic
+from benchmarks.bench_filters import SCENARIOS
+
+DEFAULT_ROWS = (100_000, 1_000_000, 10_000_000, 100_000_000)
+REPEATS = 3
+REGRESSION_RATIO = 1.25
+# Differences below this are timer noise for the sub-millisecond stages.
+REGRESSION_MIN_MS = 5
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, "data")
+HISTORY = os.path.join(HERE, "results", "history.jsonl")
+
+
+def measure(func, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def synthetic_export(rows, seed=0):
+    path = os.path.join(DATA_DIR, f"aerofit_synthetic_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        start = time.perf_counter()
+        synthetic.write_csv(path, rows, seed=seed)
+        print(f"  generated {path} in {time.perf_counter() - start:.1f} s")
+    return path
+
+
+def _remove_sidecar(path):
+    sidecar = data_loader.sidecar_path(path)
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+
+
+def stages(path):
+    """(name, func) for every stage the dashboard would run on ``path``, in order."""
+    if data_loader.use_streaming(path):
+        state = {"summary": aggregates.summarize_csv(path)}
+        yield "summary.streaming", lambda: aggregates.summarize_csv(path)
+        yield "eda.distributions", lambda: distributions.sketch_stats(state["summary"].sketches)
+    else:
+        raw = data_loader.read_csv_typed(path)
+        df = data_loader.add_derived_columns(raw.copy())
+        state = {"summary": aggregates.summarize_frame(df)}
+        yield "load.parse_csv", lambda: data_loader.read_csv_typed(path)
+        yield "load.cold", lambda: (_remove_sidecar(path), data_loader.load_dataset(path))
+        yield "load.warm", lambda: data_loader.load_dataset(path)
+        yield "derive.all", lambda: data_loader.add_derived_columns(raw.copy())
+        yield "summary.serial", lambda: aggregates.summarize_frame(df)
+        yield "summary.parallel", lambda: parallel.summarize(df)
+        yield "eda.distributions", lambda: distributions.distribution_stats(df)
+        yield "dictionary.describe", lambda: df.describe()
+        index = indexes.FilterIndex(df)
+        yield "explorer.index_build", lambda: indexes.FilterIndex(df)
+        yield "explorer.filter", lambda: [index.select(levels, ranges) for levels, ranges in SCENARIOS.values()]
+
+    summary = state["summary"]
+    yield "overview.metrics", lambda: (summary.product_counts, summary.gender_counts, summary.revenue,
+                                       summary.mean("Income"), summary.std("Income"),
+                                       summary.mean("Miles"), summary.std("Miles"))
+    yield "eda.correlation", lambda: summary.covariance.corr()
+    yield "probability.crosstabs", lambda: [summary.crosstab(column, normalize="columns")
+                                            for column in ("Gender", "Age_category", "Fitness_category")]
+    yield "insights.kpis", lambda: kpis.evaluate(summary)
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=HERE,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def load_history():
+    if not os.path.exists(HISTORY):
+        return []
+    with open(HISTORY) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_result(result):
+    os.makedirs(os.path.dirname(HISTORY), exist_ok=True)
+    with open(HISTORY, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+
+def baseline(history, result):
+    """Latest earlier run of the same size and mode measured at a different commit."""
+    for previous in reversed(history):
+        if (previous["rows"], previous["streaming"]) == (result["rows"], result["streaming"]) \
+                and previous["commit"] != result["commit"]:
+            return previous
+    return None
+
+
+def run(rows, repeats=REPEATS, history=()):
+    path = synthetic_export(rows)
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "rows": rows,
+        "streaming": data_loader.use_streaming(path),
+        "workers": parallel.WORKERS,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "timings_ms": {},
+    }
+    previous = baseline(history, result)
+    print(f"\n{rows:,} rows{' (streaming)' if result['streaming'] else ''}"
+          + (f" - compared with {previous['commit']} ({previous['timestamp']})" if previous else ""))
+    regressions = []
+    for name, func in stages(path):
+        elapsed = measure(func, repeats)
+        result["timings_ms"][name] = round(elapsed, 3)
+        line = f"  {name:<24} {elapsed:11.1f} ms"
+        before = previous and previous["timings_ms"].get(name)
+        if before:
+            ratio = elapsed / before
+            line += f"   {ratio:5.2f}x"
+            if ratio >= REGRESSION_RATIO and elapsed - before >= REGRESSION_MIN_MS:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    save_result(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the data pipeline and tab computations.")
+    parser.add_argument("rows", type=int, nargs="*", default=list(DEFAULT_ROWS))
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any stage regressed")
+    args = parser.parse_args(argv)
+
+    history = load_history()
+    regressions = []
+    for rows in args.rows:
+        regressions += [f"{rows:,} rows: {name}" for name in run(rows, args.repeats, history)]
+    print(f"\nResults appended to {HISTORY}")
+    if regressions:
+        print("Regressions:\n  " + "\n  ".join(regressions))
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Synthetic Aerofit exports of any size with the bundled export's joint structure.
+
+Usage: python -m benchmarks.synthetic rows [csv] [--seed N]
+
+``SyntheticModel.fit`` reads the bundled 180-row export. Product shares come
+from that export, and so does every categorical column's distribution given
+the product. Age is drawn per product and clipped to the observed range.
+Income is log-normal with a per-product intercept plus age and education
+slopes, so it stays stratified by product. Miles is linear in fitness and
+usage on top of a per-product intercept, so its correlations with both carry
+over. Rows are generated in chunks, so exports larger than memory can be
+written.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+CATEGORICAL = ("Gender", "MaritalStatus", "Education", "Usage", "Fitness")
+
+
+def _fit_linear(X, y):
+    """Least-squares coefficients and residual standard deviation."""
+    coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+    return coef, float(np.std(y - X @ coef))
+
+
+class SyntheticModel:
+    """Per-product parameters fitted on an export; ``sample`` draws typed rows."""
+
+    def __init__(self, products, product_p, levels, age, income, miles, bounds):
+        self.products = products
+        self.product_p = product_p
+        self.levels = levels
+        self.age = age
+        self.income = income
+        self.miles = miles
+        self.bounds = bounds
+
+    @classmethod
+    def fit(cls, df):
+        products = sorted(df["Product"].unique())
+        codes = pd.Categorical(df["Product"], categories=products).codes
+        onehot = np.eye(len(products))[codes]
+        product_p = np.bincount(codes, minlength=len(products)) / len(df)
+
+        levels = {}
+        for column in CATEGORICAL:
+            table = pd.crosstab(df["Product"], df[column], normalize="index").reindex(products)
+            levels[column] = (table.columns.to_numpy(), table.to_numpy())
+
+        age = df.groupby("Product", observed=True)["Age"].agg(["mean", "std"]).reindex(products).to_numpy()
+        X = np.column_stack([onehot, df["Age"], df["Education"]]).astype(np.float64)
+        income = _fit_linear(X, np.log(df["Income"].to_numpy(np.float64)))
+        X = np.column_stack([onehot, df["Fitness"], df["Usage"]]).astype(np.float64)
+        miles = _fit_linear(X, df["Miles"].to_numpy(np.float64))
+        bounds = {column: (df[column].min(), df[column].max()) for column in ("Age", "Income", "Miles")}
+        return cls(products, product_p, levels, age, income, miles, bounds)
+
+    def _conditional(self, rng, column, product):
+        values, p = self.levels[column]
+        # Inverse-CDF draw from each row's product-specific distribution.
+        cdf = np.cumsum(p, axis=1)[product]
+        picks = (rng.random(len(product))[:, None] > cdf).sum(axis=1)
+        return values[np.minimum(picks, len(values) - 1)]
+
+    def sample(self, rows, rng):
+        product = rng.choice(len(self.products), size=rows, p=self.product_p)
+        columns = {"Product": np.asarray(self.products)[product]}
+        mean, std = self.age[product, 0], self.age[product, 1]
+        columns["Age"] = np.clip(np.rint(rng.normal(mean, std)), *self.bounds["Age"])
+        for column in CATEGORICAL:
+            columns[column] = self._conditional(rng, column, product)
+
+        n_products = len(self.products)
+        coef, noise = self.income
+        log_income = (coef[:n_products][product] + coef[n_products] * columns["Age"]
+                      + coef[n_products + 1] * columns["Education"] + rng.normal(0, noise, rows))
+        columns["Income"] = np.clip(np.rint(np.exp(log_income)), *self.bounds["Income"])
+        coef, noise = self.miles
+        miles = (coef[:n_products][product] + coef[n_products] * columns["Fitness"]
+                 + coef[n_products + 1] * columns["Usage"] + rng.normal(0, noise, rows))
+        columns["Miles"] = np.clip(np.rint(miles), *self.bounds["Miles"])
+
+        frame = pd.DataFrame({column: columns[column] for column in data_loader.SCHEMA})
+        return frame.astype(data_loader.SCHEMA)
+
+
+def generate(rows, seed=0, model=None):
+    """A typed frame of ``rows`` synthetic customers."""
+    model = model or SyntheticModel.fit(data_loader.read_csv_typed(data_loader.DATA_FILE))
+    return model.sample(rows, np.random.default_rng(seed))
+
+
+def write_csv(path, rows, seed=0, chunk_rows=data_loader.CHUNK_ROWS * 4):
+    """Write ``rows`` synthetic customers to ``path`` one chunk at a time."""
+    model = SyntheticModel.fit(data_loader.read_csv_typed(data_loader.DATA_FILE))
+    rng = np.random.default_rng(seed)
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="") as f:
+        for start in range(0, rows, chunk_rows):
+            chunk = model.sample(min(chunk_rows, rows - start), rng)
+            chunk.to_csv(f, index=False, header=start == 0)
+    os.replace(tmp, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic Aerofit export.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("csv", nargs="?")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    path = args.csv or f"aerofit_synthetic_{args.rows}.csv"
+    start = time.perf_counter()
+    write_csv(path, args.rows, seed=args.seed)
+    print(f"Wrote {args.rows:,} rows to {path} in {time.perf_counter() - start:.1f} s "
+          f"({os.path.getsize(path) / 2 ** 20:,.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""Figure building and caching for the dashboard charts.
+
+Scatter plots switch to a level-of-detail mode above ``LOD_POINT_LIMIT`` rows:
+instead of one marker per customer they draw one marker per occupied bin and
+product, sized by count, with the bin's product mix in the hover text. Box
+and violin plots are drawn from ``distributions.distribution_stats`` rather
+than raw values.
+
+``FigureCache`` keeps built figures across reruns so unchanged charts are not
+reconstructed. Each figure's data arrays are stored in the narrowest dtype that
+shows the same values (``compact_arrays``), so Plotly serializes them as small
+base64 typed arrays rather than JSON number lists. That encoding arrived in
+Plotly 6, hence the ``plotly>=6`` requirement.
+"""
+import base64
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import profiling
+
+px = profiling.profiler.lazy("plotly.express")
+go = profiling.profiler.lazy("plotly.graph_objects")
+pio = profiling.profiler.lazy("plotly.io")
+
+PRODUCT_COLORS = ['#667eea', '#f093fb', '#11998e']
+
+LOD_POINT_LIMIT = 50_000
+BINS_2D = (80, 60)
+BINS_3D = (20, 20, 20)
+
+FIGURE_CACHE_MB = 64
+# Shorter numeric arrays are sent as JSON lists; base64 only pays off past a few values.
+MIN_BINARY_LENGTH = 16
+# Trace attributes that may mix types or are shown as written, left as given.
+_OPAQUE_ATTRIBUTES = {"customdata", "ids", "text", "hovertext", "meta"}
+
+
+def bin_by_product(df, columns, bins):
+    """Count rows per product in a regular grid over ``columns``.
+
+    Returns the product labels, the bin centers of every occupied cell (one
+    array per column) and a products x occupied-cells count matrix.
+    """
+    product = df["Product"]
+    if hasattr(product, "cat"):
+        codes, products = product.cat.codes.to_numpy(dtype=np.int64), list(product.cat.categories)
+    else:
+        codes, products = pd.factorize(product, sort=True)
+        products = list(products)
+
+    cell = np.zeros(len(df), dtype=np.int64)
+    origins = []
+    for column, n_bins in zip(columns, bins):
+        values = df[column].to_numpy(dtype=np.float64)
+        low = values.min()
+        width = (values.max() - low) / n_bins or 1.0
+        cell = cell * n_bins + np.minimum(((values - low) / width).astype(np.int64), n_bins - 1)
+        origins.append((low, width))
+
+    n_cells = int(np.prod(bins))
+    counts = np.bincount(codes * n_cells + cell, minlength=len(products) * n_cells)
+    counts = counts.reshape(len(products), n_cells)
+    occupied = np.flatnonzero(counts.sum(axis=0))
+
+    centers = []
+    for (low, width), index in zip(origins, np.unravel_index(occupied, bins)):
+        centers.append(low + (index + 0.5) * width)
+    return products, centers, counts[:, occupied]
+
+
+def _mix_labels(products, counts):
+    shares = counts / counts.sum(axis=0)
+    return [
+        " · ".join(f"{product} {share:.0%}" for product, share in zip(products, column))
+        for column in shares.T
+    ]
+
+
+def _binned_traces(df, columns, bins, trace_type, coordinates):
+    products, centers, counts = bin_by_product(df, columns, bins)
+    totals = counts.sum(axis=0)
+    mix = np.array(_mix_labels(products, counts), dtype=object)
+    scale = np.sqrt(counts.max())
+    traces = []
+    for i, product in enumerate(products):
+        present = counts[i] > 0
+        axes = {axis: center[present] for axis, center in zip(coordinates, centers)}
+        hover = "<br>".join(f"{column}: %{{{axis}:,.0f}}" for column, axis in zip(columns, coordinates))
+        traces.append(trace_type(
+            **axes,
+            mode='markers',
+            name=product,
+            marker=dict(
+                size=4 + 26 * np.sqrt(counts[i][present]) / scale,
+                color=PRODUCT_COLORS[i % len(PRODUCT_COLORS)],
+                opacity=0.7,
+            ),
+            customdata=np.column_stack([counts[i][present], totals[present], mix[present]]),
+            hovertemplate=(
+                f"<b>{product}</b><br>{hover}<br>Customers: %{{customdata[0]:,}}"
+                "<br>Bin total: %{customdata[1]:,}<br>Mix: %{customdata[2]}<extra></extra>"
+            ),
+        ))
+    return traces
+
+
+def income_miles_figure(df):
+    """Income vs Miles bubble chart; binned density above the LOD limit."""
+    if len(df) <= LOD_POINT_LIMIT:
+        df = data_loader.ensure_columns(df, ['Fitness_category'])
+        return px.scatter(df, x='Income', y='Miles', color='Product', size='Usage',
+                          hover_data=['Gender', 'Age', 'Fitness_category'],
+                          color_discrete_sequence=PRODUCT_COLORS, render_mode='webgl')
+    fig = go.Figure(_binned_traces(df, ['Income', 'Miles'], BINS_2D, go.Scattergl, ['x', 'y']))
+    fig.update_layout(xaxis_title='Income', yaxis_title='Miles', legend_title_text='Product')
+    return fig
+
+
+def feature_space_3d_figure(df):
+    """Income x Miles x Age scatter; binned voxels above the LOD limit."""
+    if len(df) <= LOD_POINT_LIMIT:
+        df = data_loader.ensure_columns(df, ['Fitness_category'])
+        return px.scatter_3d(df, x='Income', y='Miles', z='Age', color='Product',
+                             size='Usage', hover_data=['Gender', 'Fitness_category'],
+                             color_discrete_sequence=PRODUCT_COLORS)
+    fig = go.Figure(_binned_traces(df, ['Income', 'Miles', 'Age'], BINS_3D, go.Scatter3d, ['x', 'y', 'z']))
+    fig.update_layout(
+        scene=dict(xaxis_title='Income', yaxis_title='Miles', zaxis_title='Age'),
+        legend_title_text='Product',
+    )
+    return fig
+
+
+def _precomputed_box(row, position, color, **kwargs):
+    return go.Box(
+        x=[position], q1=[row["q1"]], median=[row["median"]], q3=[row["q3"]],
+        lowerfence=[row["lowerfence"]], upperfence=[row["upperfence"]],
+        mean=[row["mean"]], sd=[row["sd"]], boxpoints=False,
+        marker_color=color, **kwargs,
+    )
+
+
+def _outlier_markers(row, position, color, name):
+    return go.Scatter(
+        x=[position] * len(row["outliers"]), y=row["outliers"], mode='markers', name=name,
+        marker=dict(color=color, size=5), showlegend=False,
+        hovertemplate=f"<b>{name}</b><br>Outlier: %{{y:,}}<extra></extra>",
+    )
+
+
+def box_figure(stats, feature, colors=PRODUCT_COLORS):
+    """Per-group box plots (mean and sd shown) drawn from ``distribution_stats``."""
+    fig = go.Figure()
+    for i, (product, row) in enumerate(stats.loc[feature].iterrows()):
+        color = colors[i % len(colors)]
+        fig.add_trace(_precomputed_box(row, product, color, name=product, boxmean='sd'))
+        fig.add_trace(_outlier_markers(row, product, color, product))
+    return fig
+
+
+def violin_figure(stats, feature, width=0.8):
+    """Per-product violins with an inner box, drawn from ``distribution_stats``.
+
+    Each violin is a filled outline of its KDE curve, scaled so the widest
+    point of every product has the same width, as Plotly's own violins do.
+    """
+    fig = go.Figure()
+    products = []
+    for i, (product, row) in enumerate(stats.loc[feature].iterrows()):
+        color = PRODUCT_COLORS[i % len(PRODUCT_COLORS)]
+        half = row["kde_density"] / row["kde_density"].max() * width / 2
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([i - half, (i + half)[::-1]]),
+            y=np.concatenate([row["kde_grid"], row["kde_grid"][::-1]]),
+            fill='toself', mode='lines', name=product, legendgroup=product,
+            line=dict(color=color, width=1), opacity=0.6,
+            hoveron='points', hovertemplate=f"<b>{product}</b><br>{feature}: %{{y:,.0f}}<extra></extra>",
+        ))
+        fig.add_trace(_precomputed_box(row, i, color, name=product, legendgroup=product,
+                                       showlegend=False, boxmean=True, width=width / 8))
+        fig.add_trace(_outlier_markers(row, i, color, product))
+        products.append(product)
+    fig.update_layout(xaxis=dict(tickvals=list(range(len(products))), ticktext=products))
+    return fig
+
+
+def _narrowest(values):
+    """``values`` as the smallest numeric array that holds them, or unchanged if not numeric.
+
+    Integral floats become integers; other floats become float32, which keeps
+    more digits than any axis or hover label shows. Arrays too short to gain
+    from binary encoding become plain lists.
+    """
+    if isinstance(values, (list, tuple)) and len(values) < MIN_BINARY_LENGTH:
+        return values
+    try:
+        array = np.asarray(values)
+    except ValueError:  # ragged nested lists
+        return values
+    if array.size == 0 or array.dtype.kind not in "iuf":
+        return values
+    if array.size < MIN_BINARY_LENGTH:
+        return array.tolist()
+    if array.dtype.kind == "f":
+        if not (np.isfinite(array).all() and np.array_equal(array, np.round(array))):
+            return array.astype(np.float32)
+        array = array.astype(np.int64)
+    return array.astype(np.result_type(np.min_scalar_type(array.min()), np.min_scalar_type(array.max())))
+
+
+def _compact(props):
+    compacted = {}
+    for key, value in props.items():
+        if isinstance(value, dict):
+            value = _compact(value)
+        elif key not in _OPAQUE_ATTRIBUTES and isinstance(value, (list, tuple, np.ndarray)):
+            value = _narrowest(value)
+        compacted[key] = value
+    return compacted
+
+
+def compact_arrays(fig):
+    """A copy of ``fig`` whose numeric data arrays use the narrowest dtype."""
+    return go.Figure(data=[_compact(trace.to_plotly_json()) for trace in fig.data], layout=fig.layout)
+
+
+def _as_number_lists(value):
+    if isinstance(value, dict):
+        if "bdata" in value and "dtype" in value:
+            array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"])
+            if "shape" in value:
+                array = array.reshape([int(n) for n in value["shape"].split(",")])
+            if array.dtype == np.float32:  # shortest float32 repr, not the widened float64 one
+                return np.array([float(str(v)) for v in array.flat], dtype=object).reshape(array.shape).tolist()
+            return array.tolist()
+        return {key: _as_number_lists(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_as_number_lists(item) for item in value]
+    return value
+
+
+def list_encoded_size(fig):
+    """Bytes of ``fig`` serialized with every data array as a JSON number list."""
+    spec = _as_number_lists(json.loads(pio.to_json(fig, validate=False)))
+    return len(pio.to_json(spec, validate=False))
+
+
+def _freeze(value):
+    """Hashable form of widget state (lists, dicts and tuples nest freely)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class FigureCache:
+    """LRU of built figures keyed by chart id, widget state and data version.
+
+    Entries are weighed by their serialized JSON size and the least recently
+    used ones are evicted once the total exceeds ``max_bytes``. Safe to share
+    between sessions; cached figures must be treated as read-only.
+    ``payloads()`` compares each entry with what it would cost as plain JSON
+    number lists; that size is worked out on first request, not per build.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._list_sizes = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, chart_id, state, data_version, build):
+        return self.get_or_build_sized(chart_id, state, data_version, build)[0]
+
+    def get_or_build_sized(self, chart_id, state, data_version, build):
+        """The figure and the size of its serialized JSON in bytes."""
+        key = (chart_id, _freeze(state), _freeze(data_version))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        fig = compact_arrays(build())
+        size = len(pio.to_json(fig, validate=False))
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (fig, size)
+                self.bytes += size
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                evicted_key, (_, evicted) = self._entries.popitem(last=False)
+                self._list_sizes.pop(evicted_key, None)
+                self.bytes -= evicted
+                self.evictions += 1
+        return fig, size
+
+    def payloads(self):
+        """Per cached figure: chart id, widget state, JSON-list and typed-array bytes, share saved."""
+        with self._lock:
+            entries = list(self._entries.items())
+            known = dict(self._list_sizes)
+        rows = []
+        for key, (fig, size) in entries:
+            if key not in known:
+                known[key] = list_encoded_size(fig)
+            chart_id, state, _ = key
+            rows.append((chart_id, ", ".join(f"{name}={value}" for name, value in state), known[key], size))
+        with self._lock:
+            self._list_sizes.update((key, known[key]) for key, _ in entries if key in self._entries)
+        table = pd.DataFrame(
+            rows,
+            columns=["chart", "state", "list_bytes", "binary_bytes"],
+        )
+        table["saved"] = 1 - table["binary_bytes"] / table["list_bytes"]
+        return table.sort_values("list_bytes", ascending=False, ignore_index=True)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
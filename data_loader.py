@@ -0,0 +1,442 @@
+"""Typed loading of the Aerofit customer export.
+
+The CSV is parsed once with a compact schema and the preprocessed frame (raw
+and derived columns) is written to an uncompressed Arrow IPC sidecar file.
+Warm starts memory-map the sidecar instead of reparsing text, as long as the
+CSV's size, mtime and content hash still match. The columns are read-only
+views of the mapping, so every dashboard process on the host shares one copy
+of the data in the OS page cache.
+"""
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; without it every start parses the CSV
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE = "aerofit_treadmill.csv"
+CACHE_DIR = ".aerofit_cache"
+
+# Compact dtypes for the raw export. String columns become categoricals and the
+# small numeric columns use the narrowest integer type that holds their range.
+SCHEMA = {
+    "Product": "category",
+    "Age": "int8",
+    "Gender": "category",
+    "Education": "int8",
+    "MaritalStatus": "category",
+    "Usage": "int8",
+    "Fitness": "int8",
+    "Income": "int32",
+    "Miles": "int16",
+}
+
+# Derived-column rules shared by the dashboard and the streaming reader.
+PRODUCT_PRICES = {"KP281": 1500, "KP481": 1750, "KP781": 2500}
+FITNESS_LABELS = {1: "Poor Shape", 2: "Bad Shape", 3: "Average Shape", 4: "Good Shape", 5: "Excellent Shape"}
+AGE_BINS = [0, 21, 35, 45, 60]
+AGE_LABELS = ["Teen (0-21)", "Adult (22-35)", "Mid-age (36-45)", "Towards old-age (>46)"]
+INCOME_BANDS = [0, 40_000, 60_000, 80_000, float("inf")]
+INCOME_BAND_LABELS = ["<$40k", "$40k-60k", "$60k-80k", "$80k+"]
+
+CHUNK_ROWS = 250_000
+# Exports larger than this are summarized chunk by chunk instead of loaded whole.
+STREAMING_THRESHOLD_MB = float(os.environ.get("AEROFIT_STREAMING_MB", 1024))
+
+_HASH_BLOCK = 1 << 20
+_META_KEY = b"aerofit_source"
+
+
+def file_hash(path):
+    """Return the blake2b hex digest of a file's bytes."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(path, with_hash=True):
+    """Identity of a source file: size, mtime and (optionally) content hash."""
+    stat = os.stat(path)
+    key = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        key["hash"] = file_hash(path)
+    return key
+
+
+def cache_path(path, suffix):
+    """Location of a cache file derived from a given CSV."""
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    return os.path.join(directory, os.path.basename(path) + suffix)
+
+
+def sidecar_path(path):
+    """Location of the memory-mappable columnar cache for a given CSV."""
+    return cache_path(path, ".arrow")
+
+
+def source_matches(path, key):
+    """Whether ``path`` still has the contents described by a stored ``source_key``."""
+    current = source_key(path, with_hash=False)
+    if current["size"] != key["size"]:
+        return False
+    if current["mtime_ns"] == key["mtime_ns"]:
+        return True
+    # Same size but touched: only the content hash can tell if it really changed.
+    return file_hash(path) == key["hash"]
+
+
+def read_csv_typed(path, **kwargs):
+    """Parse the CSV with the declared schema."""
+    return pd.read_csv(path, dtype=SCHEMA, **kwargs)
+
+
+def read_rows_checked(source):
+    """Parse CSV rows, keeping only those that fit the declared schema.
+
+    Rows with missing or extra fields, non-integral or out-of-range numbers or
+    a product without a price are dropped instead of failing the whole parse.
+    """
+    raw = pd.read_csv(source, dtype=str, on_bad_lines="skip")
+    valid = raw[list(SCHEMA)].notna().all(axis=1) & raw["Product"].isin(list(PRODUCT_PRICES))
+    columns = {}
+    for column, dtype in SCHEMA.items():
+        if dtype == "category":
+            columns[column] = raw[column]
+            continue
+        values = pd.to_numeric(raw[column], errors="coerce")
+        limits = np.iinfo(dtype)
+        valid &= values.between(limits.min, limits.max) & (values % 1 == 0)
+        columns[column] = values
+    return pd.DataFrame(columns)[valid].astype(SCHEMA).reset_index(drop=True)
+
+
+def complete_lines_end(path, start, stop):
+    """Offset just past the last newline in ``[start, stop)``; ``start`` if none."""
+    with open(path, "rb") as f:
+        position = stop
+        while position > start:
+            size = min(_HASH_BLOCK, position - start)
+            f.seek(position - size)
+            newline = f.read(size).rfind(b"\n")
+            if newline >= 0:
+                return position - size + newline + 1
+            position -= size
+    return start
+
+
+class _PrefixReader(io.RawIOBase):
+    """The first ``stop`` bytes of a file, read without loading them."""
+
+    def __init__(self, path, stop):
+        self._file = open(path, "rb")
+        self._remaining = stop
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self._file.readinto(memoryview(buffer)[:self._remaining])
+        self._remaining -= count
+        return count
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def complete_lines(path, stop=None):
+    """A binary file object over the complete lines of ``path`` before byte ``stop``.
+
+    A partially written last line is left out; by default ``stop`` is the
+    current end of the file.
+    """
+    if stop is None:
+        stop = complete_lines_end(path, 0, os.path.getsize(path))
+    return io.BufferedReader(_PrefixReader(path, stop), buffer_size=_HASH_BLOCK)
+
+
+# Derived columns are declared once and computed by ``ensure_columns`` for the
+# frames that need them; a ``SharedFrame`` computes each one on first use and
+# keeps it for every later caller. Category labels are stored as categorical
+# codes and the price tier as int16, so each costs 1-2 bytes per row.
+DERIVED_COLUMNS = {}
+
+
+def derived_column(name):
+    """Register ``func(df) -> column`` as the rule for derived column ``name``."""
+    def register(func):
+        DERIVED_COLUMNS[name] = func
+        return func
+    return register
+
+
+@derived_column("Product_price")
+def _product_price(df):
+    return df["Product"].map(PRODUCT_PRICES).astype("int16")
+
+
+@derived_column("Fitness_category")
+def _fitness_category(df):
+    codes = pd.Index(list(FITNESS_LABELS)).get_indexer(df["Fitness"])
+    return pd.Categorical.from_codes(codes, categories=list(FITNESS_LABELS.values()), ordered=True)
+
+
+@derived_column("Age_category")
+def _age_category(df):
+    return pd.cut(df["Age"], bins=AGE_BINS, labels=AGE_LABELS, include_lowest=True)
+
+
+@derived_column("Income_band")
+def _income_band(df):
+    return pd.cut(df["Income"], bins=INCOME_BANDS, labels=INCOME_BAND_LABELS, right=False)
+
+
+def column_names():
+    """Every column a frame can have: the raw schema, then the derived ones."""
+    return list(SCHEMA) + list(DERIVED_COLUMNS)
+
+
+def _derive(df, name):
+    start = time.perf_counter()
+    values = DERIVED_COLUMNS[name](df)
+    if len(df) >= CHUNK_ROWS:
+        logger.info(f"Derived {name}: {pd.Series(values).memory_usage(index=False, deep=True) / 1024:,.0f} KB "
+                    f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return values
+
+
+def ensure_columns(df, names):
+    """``df`` with every registered derived column in ``names``; use the return value.
+
+    Missing columns are stored on ``df`` itself, except on a ``SharedFrame``:
+    other sessions read that one concurrently, so it is never changed. Its
+    derived columns are computed once, kept read-only beside the frame, and
+    added to a shallow copy, which is returned instead.
+    """
+    missing = [name for name in names if name in DERIVED_COLUMNS and name not in df.columns]
+    if not missing:
+        return df
+    if isinstance(df, SharedFrame):
+        return df.with_derived(missing)
+    for name in missing:
+        df[name] = _derive(df, name)
+    return df
+
+
+def derived(df, name):
+    """Column ``name`` of ``df``, deriving it first if needed."""
+    return ensure_columns(df, [name])[name]
+
+
+def add_derived_columns(df):
+    """``df`` with every registered derived column (see ``ensure_columns``)."""
+    return ensure_columns(df, DERIVED_COLUMNS)
+
+
+def describe(df):
+    """``describe()`` of the numeric columns: the raw measures and the price tier."""
+    columns = [name for name, dtype in SCHEMA.items() if dtype != "category"] + ["Product_price"]
+    return ensure_columns(df, columns)[columns].describe()
+
+
+def _read_only_values(values):
+    """``values`` as an array whose buffer cannot be written, without copying."""
+    values = values.array if isinstance(values, pd.Series) else values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.codes
+        codes.flags.writeable = False
+        return pd.Categorical.from_codes(codes, dtype=values.dtype, validate=False)
+    array = np.asarray(values).view()
+    if array.dtype == object:  # e.g. per-group arrays in the distribution statistics
+        items = array
+        array = np.empty(len(items), dtype=object)
+        array[:] = [_read_only_values(item) if isinstance(item, np.ndarray) else item for item in items]
+    array.flags.writeable = False
+    return array
+
+
+class SharedFrameError(TypeError):
+    """Raised on an attempt to modify a ``SharedFrame``."""
+
+
+class SharedFrame(pd.DataFrame):
+    """A frame every session reads, protected against accidental mutation.
+
+    Column buffers are read-only, so writing values through ``loc``, ``iloc``,
+    ``at`` or a column's ``.values`` raises. Replacing, adding or dropping
+    columns, relabelling the axes and ``inplace=True`` methods raise
+    ``SharedFrameError``. Derived columns are computed lazily by
+    ``ensure_columns``, once per frame, and handed out on a copy. Anything
+    computed from the frame (selections, slices, ``copy()``) is an ordinary
+    DataFrame, which pandas copies on write, so callers can modify their own
+    results freely.
+    """
+
+    _internal_names = pd.DataFrame._internal_names + ["_derived"]
+    _internal_names_set = set(_internal_names)
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    @property
+    def derived_columns(self):
+        """Derived columns computed so far, by name, as read-only Series."""
+        if not hasattr(self, "_derived"):
+            object.__setattr__(self, "_derived", {})
+        return self._derived
+
+    def with_derived(self, names):
+        """A shallow copy of the frame with the derived columns ``names`` added."""
+        result = self.copy(deep=False)
+        for name in names:
+            column = self.derived_columns.get(name)
+            if column is None:
+                values = _read_only_values(_derive(result, name))
+                # Two sessions may race to derive the same column; both results are equal.
+                column = self.derived_columns.setdefault(
+                    name, SharedFrame({name: values}, index=self.index, copy=False)[name])
+            result[name] = column
+        return result
+
+    def _read_only(self, *args, **kwargs):
+        raise SharedFrameError("The shared dataset is read-only; modify a copy (df.copy()) instead")
+
+    __setitem__ = __delitem__ = insert = pop = _update_inplace = _set_axis = _read_only
+
+
+def share(df):
+    """``df`` as a ``SharedFrame`` over the same column buffers, through read-only views.
+
+    ``df`` itself stays writable, so it must not be modified afterwards.
+    """
+    columns = {column: _read_only_values(df[column]) for column in df.columns}
+    return SharedFrame(columns, index=df.index, columns=df.columns, copy=False)
+
+
+def computed_columns(df):
+    """The derived columns ``df`` has, including those a ``SharedFrame`` keeps beside it."""
+    computed = dict(df.derived_columns) if isinstance(df, SharedFrame) else {}
+    computed.update((name, df[name]) for name in DERIVED_COLUMNS if name in df.columns)
+    return computed
+
+
+def derived_memory(df):
+    """Bytes used by each derived column, or None where not computed yet."""
+    computed = computed_columns(df)
+    return {
+        name: int(computed[name].memory_usage(index=False, deep=True)) if name in computed else None
+        for name in DERIVED_COLUMNS
+    }
+
+
+def iter_chunks(path=DATA_FILE, chunksize=CHUNK_ROWS, stop=None):
+    """Yield typed chunks of the CSV's complete lines (see ``complete_lines``) without loading it whole."""
+    with complete_lines(path, stop) as source, read_csv_typed(source, chunksize=chunksize) as reader:
+        yield from reader
+
+
+def use_streaming(path=DATA_FILE):
+    """Whether the export is too large to hold in memory as one frame."""
+    return os.path.getsize(path) > STREAMING_THRESHOLD_MB * 1024 * 1024
+
+
+def _read_sidecar_key(sidecar):
+    with pa.memory_map(sidecar) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    raw = metadata.get(_META_KEY)
+    if raw is None:
+        return None
+    fields = raw.decode().split(":")
+    if len(fields) != 4:
+        return None
+    size, mtime_ns, digest, stop = fields
+    return {"size": int(size), "mtime_ns": int(mtime_ns), "hash": digest, "stop": int(stop)}
+
+
+def _write_sidecar(df, sidecar, key, stop):
+    os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+    # One uncompressed record batch, so every column maps to a single buffer.
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+    metadata = dict(table.schema.metadata or {})
+    metadata[_META_KEY] = f"{key['size']}:{key['mtime_ns']}:{key['hash']}:{stop}".encode()
+    table = table.replace_schema_metadata(metadata)
+    # Processes may still map the old file; replacing it leaves their mapping
+    # intact. The temporary name is unique, so processes starting cold together
+    # never write into each other's file.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(sidecar), suffix=".tmp")
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+        os.replace(tmp, sidecar)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def map_sidecar(sidecar):
+    """The sidecar's frame, its columns zero-copy read-only views of the memory-mapped file."""
+    with pa.memory_map(sidecar) as source:
+        table = pa.ipc.open_file(source).read_all()
+    # One block per column lets pandas wrap each Arrow buffer instead of copying it.
+    return table.to_pandas(split_blocks=True)
+
+
+def _sidecar_is_fresh(path, sidecar, stop):
+    if not os.path.exists(sidecar):
+        return False
+    try:
+        cached = _read_sidecar_key(sidecar)
+    except (OSError, ValueError, pa.ArrowException):
+        return False
+    if cached is None or cached["stop"] != stop:
+        return False
+    return source_matches(path, cached)
+
+
+def load_dataset(path=DATA_FILE, use_cache=True, stop=None):
+    """Load the customer export with compact dtypes, mapping the sidecar when fresh.
+
+    Only complete lines before byte ``stop`` are loaded (by default, all
+    complete lines), so a row the feed is still writing is never parsed.
+    Derived columns are not stored; they are computed when first needed.
+    """
+    if stop is None:
+        stop = complete_lines_end(path, 0, os.path.getsize(path))
+    if not use_cache or pa is None:
+        with complete_lines(path, stop) as source:
+            return read_csv_typed(source)
+
+    sidecar = sidecar_path(path)
+    if _sidecar_is_fresh(path, sidecar, stop):
+        logger.info(f"Mapping columnar sidecar {sidecar}")
+        try:
+            return map_sidecar(sidecar)
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Could not map sidecar {sidecar}, parsing the CSV: {e}")
+
+    key = source_key(path)
+    with complete_lines(path, stop) as source:
+        df = read_csv_typed(source)
+    try:
+        _write_sidecar(df, sidecar, key, stop)
+        logger.info(f"Wrote columnar sidecar {sidecar}")
+        # Serve this process from the mapping too rather than from its private parse.
+        return map_sidecar(sidecar)
+    except (OSError, pa.ArrowException) as e:
+        # Another process may have replaced the file in between; the parse is just as good.
+        logger.warning(f"Could not write or map sidecar {sidecar}: {e}")
+        return df
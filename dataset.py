@@ -0,0 +1,189 @@
+"""The customer export as a live dataset that absorbs appended rows.
+
+The nightly feed only appends customers to ``aerofit_treadmill.csv``.
+``AppendableDataset`` remembers how many bytes of the file it has processed
+and a hash of exactly those bytes. When the file grows and that prefix still
+hashes the same, only the new complete lines are parsed and folded into the
+frame and the summary; any other change (rewritten or truncated rows, a
+different header) triggers a full rebuild.
+"""
+import copy
+import hashlib
+import io
+import logging
+import os
+import threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import aggregates
+import analytics
+import data_loader
+
+logger = logging.getLogger(__name__)
+
+_HASH_BLOCK = 1 << 20
+
+
+def _prefix_digest(path, stop):
+    """blake2b state over the first ``stop`` bytes of a file (as ``data_loader.file_hash``)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        remaining = stop
+        while remaining:
+            block = f.read(min(_HASH_BLOCK, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+
+
+def append_rows(df, delta):
+    """``df`` followed by ``delta``, keeping categorical columns categorical.
+
+    Derived columns ``df`` has already computed are carried over, computed
+    for the new rows only.
+    """
+    names = list(df.columns) + [name for name in data_loader.computed_columns(df) if name not in df.columns]
+    df = data_loader.ensure_columns(df, names)
+    delta = data_loader.ensure_columns(delta, names)
+    columns = {}
+    for column in names:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            columns[column] = union_categoricals([df[column], delta[column]])
+        else:
+            columns[column] = pd.concat([df[column], delta[column]], ignore_index=True)
+    return pd.DataFrame(columns, copy=False)
+
+
+class AppendableDataset:
+    """Preprocessed frame (or streaming summary) of the export, kept current.
+
+    In memory, ``df`` is the full preprocessed frame and ``summary`` its
+    aggregates. Above the streaming threshold only the summary is kept and
+    ``df`` is its row sample. Either way ``df`` is a read-only
+    ``data_loader.SharedFrame``, which every session reads without copying
+    and which derives columns on first use; an append swaps in a new one
+    rather than changing it. A fresh ``analytics``
+    snapshot replaces the summary pass on (re)builds and supplies
+    ``precomputed`` results until rows are appended. ``current()`` costs one
+    ``os.stat`` when the file has not changed.
+    """
+
+    def __init__(self, path=data_loader.DATA_FILE, summarize=aggregates.summarize_frame, use_snapshot=True):
+        self.path = path
+        self._summarize = summarize
+        self._use_snapshot = use_snapshot
+        self._lock = threading.Lock()
+        self._stat = None
+        self._identity = None
+        self._offset = 0
+        self._prefix_hash = None
+        self._header = b""
+        self.streaming = False
+        self.generation = 0
+        self.df = None
+        self.summary = None
+        self.precomputed = {}
+
+    @property
+    def version(self):
+        """Fingerprint of the current rows: file identity, rebuild count and bytes folded in.
+
+        Caches downstream key on this small dict instead of hashing the frame.
+        """
+        return {
+            "file": self._identity,
+            "generation": self.generation,
+            "bytes": self._offset,
+            "rows": self.summary.n_rows,
+        }
+
+    def current(self):
+        """Refresh, then return a consistent (df, summary, version, precomputed) tuple."""
+        with self._lock:
+            self._refresh()
+            return self.df, self.summary, self.version, self.precomputed
+
+    def _refresh(self):
+        stat = os.stat(self.path)
+        if self._stat is not None and (stat.st_size, stat.st_mtime_ns) == self._stat:
+            return
+        digest = None
+        if self._prefix_hash is not None and stat.st_size >= self._offset:
+            digest = _prefix_digest(self.path, self._offset)
+        if digest is None or digest.hexdigest() != self._prefix_hash:
+            if self._prefix_hash is not None:
+                logger.info(f"{self.path} changed before byte {self._offset:,}; rebuilding")
+            self._rebuild(stat)
+            return
+        # A partially written last line is left for the next refresh.
+        stop = data_loader.complete_lines_end(self.path, self._offset, stat.st_size)
+        if stop > self._offset:
+            try:
+                self._append(stop, digest)
+            except Exception:
+                # Keep serving the current rows; the range is retried when the file changes again.
+                logger.exception(f"Could not fold in bytes {self._offset:,}-{stop:,} of {self.path}")
+        self._stat = (stat.st_size, stat.st_mtime_ns)
+
+    def _rebuild(self, stat):
+        self.streaming = data_loader.use_streaming(self.path)
+        # Only complete lines are loaded; a partially written last row is
+        # appended once the feed finishes it.
+        stop = data_loader.complete_lines_end(self.path, 0, stat.st_size)
+        snapshot = analytics.load(self.path) if self._use_snapshot else None
+        if snapshot is not None and snapshot.source["stop"] != stop:
+            snapshot = None
+        if snapshot is not None:
+            logger.info(f"Using precomputed snapshot from {snapshot.created}")
+            self.summary = snapshot.summary
+            self.precomputed = snapshot.precomputed
+        else:
+            self.precomputed = {}
+        if self.streaming:
+            if snapshot is None:
+                logger.info(f"Streaming {self.path} in chunks of {data_loader.CHUNK_ROWS:,} rows")
+                self.summary = aggregates.summarize_csv(self.path, stop=stop)
+                logger.info(f"Streaming completed: {self.summary.n_rows:,} rows summarized, "
+                            f"{len(self.summary.sample):,} sampled")
+            self.df = data_loader.share(self.summary.sample)
+        else:
+            logger.info(f"Loading data from {self.path}")
+            self.df = data_loader.share(data_loader.load_dataset(self.path, stop=stop))
+            logger.info(f"Data loaded successfully: {len(self.df)} rows, {self.df.shape[1]} columns")
+            if snapshot is None:
+                self.summary = self._summarize(self.df)
+        with open(self.path, "rb") as f:
+            self._header = f.readline()
+        self._offset = stop
+        if snapshot is not None and stop == snapshot.source["size"]:
+            self._prefix_hash = snapshot.source["hash"]
+        else:
+            self._prefix_hash = _prefix_digest(self.path, stop).hexdigest()
+        self._stat = (stat.st_size, stat.st_mtime_ns)
+        self._identity = (os.path.abspath(self.path), stat.st_dev, stat.st_ino)
+        self.generation += 1
+
+    def _append(self, stop, digest):
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(stop - self._offset)
+        delta = data_loader.read_rows_checked(io.BytesIO(self._header + data))
+        skipped = sum(1 for line in data.splitlines() if line.strip()) - len(delta)
+        if skipped:
+            logger.warning(f"Skipped {skipped:,} malformed appended rows in {self.path}")
+        # Sessions may still be rendering from the current summary; update a
+        # copy, and publish nothing until the frame has been extended too.
+        summary = copy.deepcopy(self.summary).update(delta)
+        if self.streaming:
+            df = data_loader.share(summary.sample)
+        else:
+            df = data_loader.share(append_rows(self.df, delta))
+        self.summary, self.df, self.precomputed = summary, df, {}
+        digest.update(data)
+        self._prefix_hash = digest.hexdigest()
+        self._offset = stop
+        logger.info(f"Appended {len(delta):,} rows from {self.path} ({self.summary.n_rows:,} total)")
@@ -0,0 +1,168 @@
+"""Box and violin statistics computed once per numeric feature and product.
+
+The box and violin charts used to hand Plotly every raw value of every
+product. ``distribution_stats`` groups the rows by product once, sorts each
+feature within each group and reads the quartiles, Tukey whiskers, mean,
+standard deviation, a bounded list of outliers and a kernel density estimate
+on a fixed grid off the sorted slices, so the figures stay the same size
+whatever the row count. ``sketch_stats`` gives the same table from
+``sketches.ColumnSketches`` when the rows are not in memory.
+"""
+import numpy as np
+import pandas as pd
+
+DISTRIBUTION_FEATURES = ("Income", "Miles", "Usage", "Fitness", "Age")
+
+KDE_POINTS = 100
+KDE_BINS = 512
+OUTLIER_LIMIT = 200
+
+# Group label used when statistics are taken over all rows (``by=None``).
+OVERALL = "All"
+
+
+def _quantile(values, q):
+    """Linear-interpolated quantile of an already sorted array."""
+    position = (len(values) - 1) * q
+    low = int(np.floor(position))
+    high = min(low + 1, len(values) - 1)
+    return float(values[low] + (values[high] - values[low]) * (position - low))
+
+
+def _bandwidth(n, sd, q1, q3):
+    """Silverman's rule, the same default Plotly uses for its violins."""
+    spread = min(sd, (q3 - q1) / 1.349) or sd
+    return 1.059 * spread * n ** -0.2 if spread else 0.0
+
+
+def _outliers(values, lowerfence, upperfence):
+    """Distinct values beyond the whiskers, thinned to ``OUTLIER_LIMIT``."""
+    low = values[:np.searchsorted(values, lowerfence, side="left")]
+    high = values[np.searchsorted(values, upperfence, side="right"):]
+    outliers = np.unique(np.concatenate([low, high]))
+    if len(outliers) > OUTLIER_LIMIT:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, OUTLIER_LIMIT).round().astype(np.int64)]
+    return outliers
+
+
+def _kde(centers, counts, bandwidth, low, high, points=KDE_POINTS):
+    """Gaussian KDE of binned values, evaluated on ``points`` values from low to high.
+
+    Working from bin counts keeps the cost independent of the row count.
+    """
+    grid = np.linspace(low, high, points)
+    if high == low or not bandwidth:
+        return grid, np.ones(points)
+    distance = (grid[:, None] - centers[None, :]) / bandwidth
+    density = np.exp(-0.5 * distance ** 2) @ counts / (counts.sum() * bandwidth * np.sqrt(2 * np.pi))
+    return grid, density
+
+
+def _binned_kde(values, bandwidth):
+    low, high = float(values[0]), float(values[-1])
+    if high == low:
+        return _kde(np.array([low]), np.array([len(values)]), bandwidth, low, high)
+    counts, edges = np.histogram(values, bins=KDE_BINS, range=(low, high))
+    return _kde((edges[:-1] + edges[1:]) / 2, counts, bandwidth, low, high)
+
+
+def _group_codes(df, by):
+    if by is None:
+        return np.zeros(len(df), dtype=np.int8), [OVERALL]
+    group = df[by]
+    if hasattr(group, "cat"):
+        return group.cat.codes.to_numpy(), list(group.cat.categories)
+    codes, labels = pd.factorize(group, sort=True)
+    return codes, list(labels)
+
+
+def _frame(rows, by):
+    stats = pd.DataFrame.from_dict(rows, orient="index")
+    stats.index.names = ["feature", by or "group"]
+    return stats
+
+
+def distribution_stats(df, features=DISTRIBUTION_FEATURES, by="Product"):
+    """Box and violin statistics for every feature x ``by`` group.
+
+    ``by=None`` gives one group, ``OVERALL``, covering every row.
+
+    Returns a frame indexed by (feature, group) with ``n``, ``min``, ``q1``,
+    ``median``, ``q3``, ``max``, the whisker ends ``lowerfence`` and
+    ``upperfence``, ``mean`` and ``sd``, plus ``outliers``, ``kde_grid`` and
+    ``kde_density`` arrays.
+    """
+    codes, labels = _group_codes(df, by)
+    by_group = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[by_group], np.arange(len(labels) + 1))
+
+    rows = {}
+    for feature in features:
+        grouped = df[feature].to_numpy()[by_group]
+        for i, label in enumerate(labels):
+            group_values = np.sort(grouped[bounds[i]:bounds[i + 1]]).astype(np.float64)
+            if not len(group_values):
+                continue
+            q1, median, q3 = (_quantile(group_values, q) for q in (0.25, 0.5, 0.75))
+            iqr = q3 - q1
+            within = group_values[np.searchsorted(group_values, q1 - 1.5 * iqr, side="left"):
+                                  np.searchsorted(group_values, q3 + 1.5 * iqr, side="right")]
+            lowerfence, upperfence = float(within[0]), float(within[-1])
+            sd = float(group_values.std(ddof=1)) if len(group_values) > 1 else 0.0
+            grid, density = _binned_kde(group_values, _bandwidth(len(group_values), sd, q1, q3))
+            rows[(feature, label)] = {
+                "n": len(group_values),
+                "min": float(group_values[0]),
+                "q1": q1,
+                "median": median,
+                "q3": q3,
+                "max": float(group_values[-1]),
+                "lowerfence": lowerfence,
+                "upperfence": upperfence,
+                "mean": float(group_values.mean()),
+                "sd": sd,
+                "outliers": _outliers(group_values, lowerfence, upperfence),
+                "kde_grid": grid,
+                "kde_density": density,
+            }
+    return _frame(rows, by)
+
+
+def sketch_stats(sketches, features=DISTRIBUTION_FEATURES, by="Product"):
+    """The same statistics as ``distribution_stats``, from ``ColumnSketches`` alone.
+
+    Quartiles carry the sketch's rank error. Whiskers and outliers are picked
+    from the values the sketch retained plus the exact min and max, so the
+    outlier list is a representative subset; the violins are smoothed from
+    the fixed-bin histograms.
+    """
+    groups = [None] if by is None else sketches.groups
+    rows = {}
+    for feature in features:
+        for group in groups:
+            sketch = sketches.sketch(feature, group)
+            q1, median, q3 = sketch.quantile([0.25, 0.5, 0.75])
+            iqr = q3 - q1
+            retained = np.unique(np.concatenate([[sketch.min, sketch.max], sketch.items()[0]]))
+            within = retained[(retained >= q1 - 1.5 * iqr) & (retained <= q3 + 1.5 * iqr)]
+            lowerfence, upperfence = float(within[0]), float(within[-1])
+            histogram = sketches.histogram(feature, group)
+            left, counts = histogram.bins()
+            grid, density = _kde(left + histogram.width / 2, counts, _bandwidth(sketch.n, sketch.std, q1, q3),
+                                 sketch.min, sketch.max)
+            rows[(feature, OVERALL if group is None else group)] = {
+                "n": sketch.n,
+                "min": sketch.min,
+                "q1": float(q1),
+                "median": float(median),
+                "q3": float(q3),
+                "max": sketch.max,
+                "lowerfence": lowerfence,
+                "upperfence": upperfence,
+                "mean": sketch.mean,
+                "sd": sketch.std,
+                "outliers": _outliers(retained, lowerfence, upperfence),
+                "kde_grid": grid,
+                "kde_density": density,
+            }
+    return _frame(rows, by)
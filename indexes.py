@@ -0,0 +1,123 @@
+"""Prebuilt filter indexes for the Interactive Data Explorer.
+
+Label columns get one packed bitmap per level, numeric columns a sorted
+permutation searched with binary search. A filter request becomes a handful of
+bitwise ORs/ANDs over packed bitmaps instead of full-length boolean masks, and
+filters that select everything are skipped entirely.
+"""
+import numpy as np
+
+BITMAP_COLUMNS = ("Product", "Gender", "MaritalStatus", "Fitness")
+RANGE_COLUMNS = ("Age", "Income", "Usage")
+
+
+class FilterIndex:
+    """Bitmap and sorted indexes over one frame."""
+
+    def __init__(self, df, bitmap_columns=BITMAP_COLUMNS, range_columns=RANGE_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for column in bitmap_columns:
+            values = df[column]
+            if hasattr(values, "cat"):
+                levels, codes = values.cat.categories, values.cat.codes.to_numpy()
+            else:
+                codes, levels = values.factorize(sort=True)
+            self.bitmaps[column] = {
+                level: np.packbits(codes == code) for code, level in enumerate(levels.tolist())
+            }
+
+        position_dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        self.sorted = {}
+        for column in range_columns:
+            values = df[column].to_numpy()
+            order = np.argsort(values, kind="stable").astype(position_dtype)
+            self.sorted[column] = (values[order], order)
+
+    def levels(self, column):
+        return list(self.bitmaps[column])
+
+    def bounds(self, column):
+        values, _ = self.sorted[column]
+        return values[0].item(), values[-1].item()
+
+    def _levels_bitmap(self, column, selected):
+        bitmaps = self.bitmaps[column]
+        if set(bitmaps) <= set(selected):
+            return None
+        chosen = [bitmaps[level] for level in selected if level in bitmaps]
+        if not chosen:
+            return np.zeros_like(next(iter(bitmaps.values())))
+        return np.bitwise_or.reduce(chosen)
+
+    def _range_bitmap(self, column, low, high):
+        values, order = self.sorted[column]
+        start = np.searchsorted(values, low, side="left")
+        stop = np.searchsorted(values, high, side="right")
+        if start == 0 and stop == len(values):
+            return None
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[order[start:stop]] = True
+        return np.packbits(mask)
+
+    def select(self, levels=None, ranges=None):
+        """Row positions matching every level list and inclusive range given.
+
+        ``levels`` maps a bitmap column to the allowed labels, ``ranges`` maps a
+        range column to a ``(low, high)`` pair.
+        """
+        bitmaps = [self._levels_bitmap(column, selected) for column, selected in (levels or {}).items()]
+        bitmaps += [self._range_bitmap(column, *bounds) for column, bounds in (ranges or {}).items()]
+        bitmaps = [bitmap for bitmap in bitmaps if bitmap is not None]
+        if not bitmaps:
+            return np.arange(self.n_rows)
+        combined = np.bitwise_and.reduce(bitmaps) if len(bitmaps) > 1 else bitmaps[0]
+        return np.flatnonzero(np.unpackbits(combined, count=self.n_rows))
+
+    def order_by(self, positions, keys, column, descending=False):
+        """``positions`` ordered by ``column`` (ties keep row order either way).
+
+        Range columns reuse their prebuilt sorted permutation; other columns
+        are sorted over the matching rows only, using ``keys`` (one sortable
+        value per row of the indexed frame).
+        """
+        if column in self.sorted:
+            values, order = self.sorted[column]
+            if len(positions) == self.n_rows:
+                ordered, ordered_keys = order, values
+            else:
+                member = np.zeros(self.n_rows, dtype=bool)
+                member[positions] = True
+                keep = member[order]
+                ordered, ordered_keys = order[keep], values[keep]
+        else:
+            ordered = positions[np.argsort(keys[positions], kind="stable")]
+            ordered_keys = keys[ordered]
+        return _reverse_runs(ordered, ordered_keys) if descending else ordered
+
+
+def _reverse_runs(ordered, ordered_keys):
+    """Ascending ``ordered`` turned descending, each run of equal keys kept in row order."""
+    n = len(ordered)
+    if n == 0:
+        return ordered
+    starts = np.flatnonzero(np.r_[True, ordered_keys[1:] != ordered_keys[:-1]])
+    lengths = np.diff(np.r_[starts, n])
+    # A run starting at s moves to start at n - (s + length); rows inside it keep their order.
+    shift = np.repeat(n - 2 * starts - lengths, lengths)
+    reversed_runs = np.empty_like(ordered)
+    reversed_runs[np.arange(n) + shift] = ordered
+    return reversed_runs
+
+
+def sort_keys(series):
+    """Numeric sort keys for a column; categoricals sort by their codes."""
+    if hasattr(series, "cat"):
+        return series.cat.codes.to_numpy()
+    return series.to_numpy()
+
+
+def page_slice(n_matches, page, page_size):
+    """Start/stop offsets of a 1-based page, clamped to the match count."""
+    start = min((page - 1) * page_size, n_matches)
+    return start, min(start + page_size, n_matches)
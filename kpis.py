@@ -0,0 +1,186 @@
+"""Dashboard KPIs declared as expressions over the aggregate cube.
+
+Each KPI is a small function of a ``KPITable`` registered with ``@kpi(name,
+dimensions)``. ``evaluate`` rolls the summary's cube up once to the union of
+the registered dimensions and evaluates every expression against that one
+table, so the figures quoted in the Probability, Insights and Complete
+Analysis tabs follow the data without a scan per KPI. Quantile KPIs read the
+rows when they are in memory, interpolating like the box plots do, and the
+summary's column sketches otherwise.
+"""
+import numpy as np
+import pandas as pd
+
+import aggregates
+import data_loader
+import distributions
+
+KPIS = {}
+
+PREMIUM_PRODUCT = max(data_loader.PRODUCT_PRICES, key=data_loader.PRODUCT_PRICES.get)
+TOP_FITNESS = data_loader.FITNESS_LABELS[max(data_loader.FITNESS_LABELS)]
+TEEN = data_loader.AGE_LABELS[0]
+MILES_RANGE = (0.25, 0.75)
+OUTLIER_COLUMNS = ("Miles", "Income")
+
+
+def kpi(name, dimensions=()):
+    """Register ``func(table) -> value`` as KPI ``name`` over the cube ``dimensions``."""
+    def register(func):
+        KPIS[name] = (tuple(dimensions), func)
+        return func
+    return register
+
+
+class KPITable:
+    """Counts and sums of the cube rolled up to ``dimensions``.
+
+    Built with one grouped pass; every query re-aggregates this small table.
+    ``df``, when given, is the full set of rows the summary covers.
+    """
+
+    def __init__(self, summary, dimensions, df=None):
+        self.dimensions = [d for d in aggregates.CUBE_DIMENSIONS if d in dimensions]
+        columns = ["count"] + [f"sum_{measure}" for measure in aggregates.CUBE_MEASURES]
+        if self.dimensions:
+            self.table = summary.cube.table.groupby(self.dimensions, dropna=False)[columns].sum()
+        else:
+            self.table = summary.cube.table[columns].sum().to_frame().T
+        self.sketches = summary.sketches
+        self.df = df
+
+    def _rollup(self, by):
+        by = [by] if isinstance(by, str) else list(by)
+        if not by:
+            return self.table.sum()
+        return self.table.groupby(level=by).sum()
+
+    def counts(self, by):
+        return self._rollup(by)["count"]
+
+    def share(self, dimension, given=None, level=None):
+        """Percentage of rows at each level of ``dimension``.
+
+        With ``given``, only rows where ``given`` equals ``level`` count; an
+        unobserved ``level`` gives an empty Series.
+        """
+        if given is None:
+            counts = self.counts(dimension)
+        else:
+            table = self.counts([dimension, given]).unstack(fill_value=0)
+            if level not in table.columns:
+                return pd.Series(dtype="float64")
+            counts = table[level]
+        return counts / counts.sum() * 100
+
+    def sum(self, measure, by=()):
+        return self._rollup(by)[f"sum_{measure}"]
+
+    def mean(self, measure, by=()):
+        rollup = self._rollup(by)
+        return rollup[f"sum_{measure}"] / rollup["count"]
+
+    def quantiles(self, column, q):
+        """``q`` quantiles of ``column`` per product, one column per quantile."""
+        if self.df is not None:
+            return self.df.groupby("Product", observed=True)[column].quantile(q).unstack()
+        return pd.DataFrame(
+            {group: self.sketches.quantile(column, q, group) for group in self.sketches.groups}, index=q
+        ).T
+
+    def upper_outliers(self, column):
+        """Tukey upper fence ``q3 + 1.5 * IQR`` of ``column`` and the rows above it."""
+        if self.df is not None:
+            stats = distributions.distribution_stats(self.df, features=[column], by=None).loc[(column, distributions.OVERALL)]
+            fence = stats["q3"] + 1.5 * (stats["q3"] - stats["q1"])
+            return float(fence), int((self.df[column] > fence).sum())
+        sketch = self.sketches.sketch(column)
+        q1, q3 = sketch.quantile([0.25, 0.75])
+        fence = float(q3 + 1.5 * (q3 - q1))
+        return fence, int(round(sketch.n * (1 - sketch.rank(fence))))
+
+
+def _top(shares):
+    """Level with the largest share and that share, or (None, nan) if there are none."""
+    if shares.empty:
+        return None, np.nan
+    level = shares.idxmax()
+    return level, float(shares[level])
+
+
+@kpi("product_share", ["Product"])
+def _product_share(table):
+    return table.share("Product")
+
+
+@kpi("gender_share", ["Gender"])
+def _gender_share(table):
+    return table.share("Gender")
+
+
+@kpi("market_leader", ["Product"])
+def _market_leader(table):
+    return _top(table.share("Product"))
+
+
+@kpi("female_preference", ["Product", "Gender"])
+def _female_preference(table):
+    return _top(table.share("Product", given="Gender", level="Female"))
+
+
+@kpi("product_by_gender", ["Product", "Gender"])
+def _product_by_gender(table):
+    return {gender: table.share("Product", given="Gender", level=gender) for gender in ("Female", "Male")}
+
+
+@kpi("male_premium", ["Product", "Gender"])
+def _male_premium(table):
+    return PREMIUM_PRODUCT, float(table.share("Product", given="Gender", level="Male").get(PREMIUM_PRODUCT, np.nan))
+
+
+@kpi("teen_preference", ["Product", "Age_category"])
+def _teen_preference(table):
+    shares = table.share("Product", given="Age_category", level=TEEN)
+    return _top(shares) + (float(shares.get(PREMIUM_PRODUCT, 0.0)),)
+
+
+@kpi("product_by_fitness", ["Product", "Fitness_category"])
+def _product_by_fitness(table):
+    return table.share("Product", given="Fitness_category", level=TOP_FITNESS)
+
+
+@kpi("fitness_elite", ["Product", "Fitness_category"])
+def _fitness_elite(table):
+    return _top(_product_by_fitness(table))
+
+
+@kpi("avg_revenue", ["Product"])
+def _avg_revenue(table):
+    return float(table.sum("Product_price", by="Product").mean())
+
+
+@kpi("miles_range")
+def _miles_range(table):
+    return table.quantiles("Miles", list(MILES_RANGE))
+
+
+@kpi("age_mix", ["Product", "Age_category"])
+def _age_mix(table):
+    counts = table.counts(["Product", "Age_category"]).unstack(fill_value=0)
+    return counts.reindex(columns=data_loader.AGE_LABELS, fill_value=0)
+
+
+@kpi("outliers")
+def _outliers(table):
+    return {column: table.upper_outliers(column) for column in OUTLIER_COLUMNS}
+
+
+def evaluate(summary, kpis=None, df=None):
+    """Value of every KPI in ``kpis`` (default: all registered), from one rollup of the cube.
+
+    Pass the rows as ``df`` when they are all in memory, for exact quantiles.
+    """
+    kpis = KPIS if kpis is None else {name: KPIS[name] for name in kpis}
+    dimensions = {d for dims, _ in kpis.values() for d in dims}
+    table = KPITable(summary, dimensions, df)
+    return {name: expression(table) for name, (_, expression) in kpis.items()}
@@ -0,0 +1,205 @@
+"""Row-partitioned summaries computed in a process pool.
+
+``summarize`` copies each column's buffer once into a memory-mapped file (in
+``/dev/shm`` where there is one, so it stays in RAM), hands every worker
+process a row range, lets it build an ``aggregates.StreamingSummary``
+over zero-copy views of its partition and merges the partial summaries. The
+tabs read the same cube, covariance and sketches as with the serial path;
+inputs below ``PARALLEL_MIN_ROWS`` or with a single worker stay serial.
+"""
+import atexit
+import logging
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import traceback
+import numpy as np
+import pandas as pd
+
+import aggregates
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.environ.get("AEROFIT_WORKERS", 0)) or os.cpu_count() or 1
+PARALLEL_MIN_ROWS = 1_000_000
+# Column files live in RAM-backed /dev/shm where available, else the temp directory.
+SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+_workers = []
+_lock = threading.Lock()
+
+
+class _Worker:
+    """A process running this file as its own script, fed tasks over a pair of pipes.
+
+    multiprocessing would start workers that re-import ``__main__``, which
+    under Streamlit is ``app.py``, so each worker would run the whole app.
+    Here the worker's ``__main__`` is this module, which imports only what a
+    partition summary needs, and nothing of the parent is inherited.
+    """
+
+    def __init__(self):
+        task_read, task_write = os.pipe()
+        result_read, result_write = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), str(task_read), str(result_write)],
+                pass_fds=(task_read, result_write), stdin=subprocess.DEVNULL,
+            )
+        except BaseException:
+            for fd in (task_read, task_write, result_read, result_write):
+                os.close(fd)
+            raise
+        os.close(task_read)
+        os.close(result_write)
+        self._tasks = open(task_write, "wb")
+        self._results = open(result_read, "rb")
+
+    @property
+    def alive(self):
+        return self.process.poll() is None
+
+    def submit(self, *task):
+        pickle.dump(task, self._tasks, protocol=pickle.HIGHEST_PROTOCOL)
+        self._tasks.flush()
+
+    def result(self):
+        try:
+            ok, value = pickle.load(self._results)
+        except EOFError:
+            raise RuntimeError(f"Summary worker {self.process.pid} exited with code {self.process.wait()}") from None
+        if not ok:
+            raise RuntimeError(f"Summary worker {self.process.pid} failed:\n{value}")
+        return value
+
+    def close(self):
+        # The worker exits when its task pipe reaches end of file.
+        self._tasks.close()
+        self._results.close()
+        self.process.wait()
+
+
+def _get_workers(workers):
+    """``workers`` running worker processes, reusing those from earlier calls; call under ``_lock``."""
+    _workers[:] = [worker for worker in _workers if worker.alive]
+    while len(_workers) < workers:
+        _workers.append(_Worker())
+    return _workers[:workers]
+
+
+def _discard_workers():
+    while _workers:
+        worker = _workers.pop()
+        worker.process.kill()
+        worker.close()
+
+
+@atexit.register
+def _shutdown():
+    with _lock:
+        while _workers:
+            _workers.pop().close()
+
+
+def _share(df):
+    """Copy every column into its own memory-mapped file.
+
+    Categorical and text columns are shared as integer codes plus their
+    labels. Returns the file paths (owned by the caller) and a picklable layout.
+    """
+    paths, layout = [], []
+    try:
+        for column in df.columns:
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                array, labels = series.cat.codes.to_numpy(), list(series.cat.categories)
+                ordered = series.cat.ordered
+            elif pd.api.types.is_numeric_dtype(series.dtype):
+                array, labels, ordered = series.to_numpy(), None, False
+            else:
+                codes, uniques = pd.factorize(series)
+                array, labels, ordered = codes, list(uniques), False
+            fd, path = tempfile.mkstemp(prefix="aerofit-", suffix=".col", dir=SHARED_DIR)
+            os.close(fd)
+            paths.append(path)
+            mapped = np.memmap(path, array.dtype, mode="w+", shape=array.shape)
+            mapped[:] = array
+            del mapped
+            layout.append((column, path, array.dtype.str, labels, ordered))
+    except BaseException:
+        _release(paths)
+        raise
+    return paths, layout
+
+
+def _release(paths):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _summarize_partition(layout, n_rows, start, stop, seed):
+    columns = {}
+    for column, path, dtype, labels, ordered in layout:
+        view = np.memmap(path, np.dtype(dtype), mode="r", shape=(n_rows,))[start:stop]
+        if labels is None:
+            columns[column] = view
+        else:
+            columns[column] = pd.Categorical.from_codes(view, categories=labels, ordered=ordered)
+    return aggregates.summarize_frame(pd.DataFrame(columns, copy=False), seed)
+
+
+def summarize(df, workers=WORKERS, min_rows=PARALLEL_MIN_ROWS):
+    """``aggregates.summarize_frame`` over row partitions in ``workers`` processes.
+
+    Stays serial where workers cannot be handed their pipes (Windows).
+    """
+    if workers <= 1 or len(df) < max(min_rows, 1) or os.name != "posix":
+        return aggregates.summarize_frame(df)
+
+    paths, layout = _share(df)
+    try:
+        with _lock:
+            pool = _get_workers(workers)
+            bounds = np.linspace(0, len(df), workers + 1).astype(np.int64)
+            # One seed per partition, so the partitions' sketches do not flip the same coins.
+            seeds = np.random.SeedSequence(0).spawn(workers)
+            try:
+                for worker, start, stop, seed in zip(pool, bounds[:-1], bounds[1:], seeds):
+                    worker.submit(layout, len(df), int(start), int(stop), seed)
+                summary = pool[0].result()
+                for worker in pool[1:]:
+                    summary.merge(worker.result())
+            except BaseException:
+                # Workers may hold unread results; start clean next time.
+                _discard_workers()
+                raise
+    finally:
+        _release(paths)
+    logger.info(f"Summarized {len(df):,} rows in {workers} partitions")
+    return summary
+
+
+def _serve(task_fd, result_fd):
+    """Worker loop: summarize each partition read from ``task_fd`` until it is closed."""
+    with open(task_fd, "rb") as tasks, open(result_fd, "wb") as results:
+        while True:
+            try:
+                task = pickle.load(tasks)
+            except EOFError:
+                return
+            try:
+                reply = (True, _summarize_partition(*task))
+            except Exception:
+                reply = (False, traceback.format_exc())
+            pickle.dump(reply, results, protocol=pickle.HIGHEST_PROTOCOL)
+            results.flush()
+
+
+if __name__ == "__main__":
+    _serve(int(sys.argv[1]), int(sys.argv[2]))
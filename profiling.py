@@ -0,0 +1,213 @@
+"""Cold-start profiling, deferred imports and per-rerun render timing.
+
+``profiler`` lives for the whole server process. It records how long each
+profiled import took, how long the first script run spent in each phase (data
+load, first render) and compares the total against a cold-start budget. Set
+``AEROFIT_PROFILE_STARTUP=1`` to show the report in the dashboard; the
+measurements themselves are always taken and logged once.
+
+``renders`` keeps the spans (sections, charts, data steps) of the most recent
+script runs of every session, for the dashboard's Performance view.
+"""
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("AEROFIT_PROFILE_STARTUP") == "1"
+BUDGET_SECONDS = float(os.environ.get("AEROFIT_STARTUP_BUDGET_S", 3.0))
+RECENT_RUNS = 200
+MAX_SESSIONS = 100
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name, profiler):
+        super().__init__(name)
+        self.__dict__["_profiler"] = profiler
+        self.__dict__["_module"] = None
+
+    def __getattr__(self, attribute):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = self.__dict__["_profiler"].import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return getattr(module, attribute)
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports = {}
+        self.phases = {}
+        self.finished = False
+
+    def import_module(self, name):
+        """Import ``name`` and record the time it took if it was not loaded yet."""
+        if name in sys.modules:
+            return sys.modules[name]
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports[name] = time.perf_counter() - start
+        return module
+
+    def preload(self, *names):
+        """Import optional modules up front so their cost is attributed to them."""
+        for name in names:
+            try:
+                self.import_module(name)
+            except ImportError:
+                pass
+
+    def lazy(self, name):
+        """A module proxy whose import is deferred until first use."""
+        if name in sys.modules:
+            return sys.modules[name]
+        return LazyModule(name, self)
+
+    @contextmanager
+    def phase(self, name):
+        """Time a phase of the first script run; later runs are not recorded."""
+        if self.finished:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+    def finish(self):
+        """Close the first run's measurements and log them once."""
+        if self.finished:
+            return
+        self.finished = True
+        phases = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items())
+        imports = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.imports.items())
+        logger.info(f"Startup profile: {phases}; imports: {imports or 'none'}")
+        if self.total > BUDGET_SECONDS:
+            logger.warning(f"Cold start took {self.total:.2f}s, over the {BUDGET_SECONDS:.1f}s budget")
+
+    def report(self):
+        """Rows of (kind, name, seconds) for display."""
+        rows = [("import", name, seconds) for name, seconds in self.imports.items()]
+        rows += [("phase", name, seconds) for name, seconds in self.phases.items()]
+        return rows
+
+
+profiler = StartupProfiler()
+
+
+def row_count(obj):
+    """Rows behind a frame or summary argument, or None if it has none."""
+    n_rows = getattr(obj, "n_rows", None)
+    if n_rows is not None:
+        return n_rows
+    if hasattr(obj, "columns") and hasattr(obj, "__len__"):
+        return len(obj)
+    return None
+
+
+def frame_bytes(df):
+    """Size of ``df`` as the Arrow table Streamlit sends for ``st.dataframe``."""
+    import pyarrow as pa
+    return pa.Table.from_pandas(df, preserve_index=False).nbytes
+
+
+class RerunTrace:
+    """Spans recorded during one script run of one session."""
+
+    def __init__(self, session):
+        self.session = session
+        self.started = time.perf_counter()
+        self.spans = []
+
+    @contextmanager
+    def span(self, kind, name, rows=None, bytes=None):
+        """Time the block; the yielded record's ``rows`` and ``bytes`` may be filled in."""
+        record = {"kind": kind, "name": name, "rows": rows, "bytes": bytes, "seconds": 0.0}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self.spans.append(record)
+
+
+class RenderStats:
+    """Spans of the most recent script runs, and totals per session.
+
+    Shared by all sessions of the server process.
+    """
+
+    def __init__(self, max_runs=RECENT_RUNS, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._runs = deque(maxlen=max_runs)
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, session):
+        return RerunTrace(session)
+
+    def finish(self, trace):
+        seconds = time.perf_counter() - trace.started
+        payload = sum(span["bytes"] or 0 for span in trace.spans)
+        with self._lock:
+            self._runs.append({"session": trace.session, "seconds": seconds, "bytes": payload,
+                               "spans": trace.spans})
+            totals = self._sessions.pop(trace.session, {"reruns": 0, "seconds": 0.0, "bytes": 0})
+            totals = {"reruns": totals["reruns"] + 1, "seconds": totals["seconds"] + seconds,
+                      "bytes": totals["bytes"] + payload}
+            self._sessions[trace.session] = totals
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def runs(self):
+        """One row per recent rerun: session, seconds and payload bytes."""
+        import pandas as pd
+        with self._lock:
+            runs = [{key: run[key] for key in ("session", "seconds", "bytes")} for run in self._runs]
+        return pd.DataFrame(runs, columns=["session", "seconds", "bytes"])
+
+    def spans(self):
+        """Per (kind, name): calls, p50/p95/max milliseconds, median rows and bytes, over recent reruns."""
+        import pandas as pd
+        with self._lock:
+            spans = [span for run in self._runs for span in run["spans"]]
+        columns = ["kind", "name", "calls", "p50_ms", "p95_ms", "max_ms", "rows", "bytes"]
+        if not spans:
+            return pd.DataFrame(columns=columns)
+        frame = pd.DataFrame(spans)
+        frame["ms"] = frame["seconds"] * 1000
+        grouped = frame.groupby(["kind", "name"], sort=False)
+        table = pd.DataFrame({
+            "calls": grouped.size(),
+            "p50_ms": grouped["ms"].median(),
+            "p95_ms": grouped["ms"].quantile(0.95),
+            "max_ms": grouped["ms"].max(),
+            "rows": grouped["rows"].median(),
+            "bytes": grouped["bytes"].median(),
+        })
+        return table.reset_index().sort_values("p95_ms", ascending=False, ignore_index=True)[columns]
+
+    def sessions(self):
+        """Totals per session, most recently active first."""
+        import pandas as pd
+        with self._lock:
+            rows = [{"session": session, **totals} for session, totals in reversed(self._sessions.items())]
+        return pd.DataFrame(rows, columns=["session", "reruns", "seconds", "bytes"])
+
+
+renders = RenderStats()
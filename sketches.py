@@ -0,0 +1,214 @@
+"""Mergeable quantile sketches and fixed-bin histograms.
+
+Both are built from one chunk (or partition) at a time and merged, so the
+Distribution and Outliers views can be drawn for exports that never fit in
+memory. ``KLLSketch`` answers rank and quantile queries within a normalized
+rank error of about ``SKETCH_ERROR`` using a few hundred retained values;
+``FixedHistogram`` counts values in zero-aligned bins of a fixed width, so
+histograms from chunks with different ranges add up bin for bin.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+SKETCH_ERROR = float(os.environ.get("AEROFIT_SKETCH_ERROR", 0.01))
+MIN_LEVEL_CAPACITY = 8
+
+SKETCH_COLUMNS = ("Age", "Education", "Usage", "Fitness", "Income", "Miles")
+HISTOGRAM_WIDTHS = {"Income": 1000, "Miles": 5}
+
+
+def k_for_error(epsilon):
+    """Smallest KLL ``k`` whose single-quantile rank error is about ``epsilon``."""
+    # Empirical fit from the KLL paper's experiments (as used by Apache DataSketches).
+    return max(MIN_LEVEL_CAPACITY, int(np.ceil((2.296 / epsilon) ** (1 / 0.9723))))
+
+
+class KLLSketch:
+    """KLL quantile sketch over float values.
+
+    Level ``h`` holds values that each stand for ``2**h`` inputs. When a level
+    outgrows its capacity it is sorted and every other value (from a random
+    offset) is promoted to the level above. Count, min, max, sum and sum of
+    squares are tracked exactly alongside. Sketches that are merged must not
+    share a ``seed``, or their offsets fall in step and the error compounds.
+    """
+
+    def __init__(self, k=None, seed=None):
+        self.k = k or k_for_error(SKETCH_ERROR)
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(MIN_LEVEL_CAPACITY, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        while True:
+            full = [h for h, items in enumerate(self.levels) if len(items) > self._capacity(h)]
+            if not full:
+                return
+            h = full[0]
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[h])
+            # An odd value out stays behind so the promoted half is exact.
+            stay = len(items) % 2
+            self.levels[h] = items[:stay]
+            promoted = items[stay + self._rng.integers(2)::2]
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.total += float(values.sum())
+        self.total_sq += float(np.square(values).sum())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        if not other.n:
+            return self
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.total_sq += other.total_sq
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self._compress()
+        return self
+
+    def items(self):
+        """Retained values in ascending order and the weight of each."""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def quantile(self, q):
+        """Approximate ``q`` quantile(s); 0 and 1 give the exact min and max."""
+        values, weights = self.items()
+        ranks = np.cumsum(weights) / weights.sum()
+        q = np.asarray(q, dtype=np.float64)
+        result = values[np.minimum(np.searchsorted(ranks, q, side="left"), len(values) - 1)]
+        result = np.where(q <= 0, self.min, np.where(q >= 1, self.max, result))
+        return float(result) if result.ndim == 0 else result
+
+    def rank(self, value):
+        """Approximate fraction of inputs less than or equal to ``value``."""
+        values, weights = self.items()
+        return float(weights[:np.searchsorted(values, value, side="right")].sum() / weights.sum())
+
+    @property
+    def mean(self):
+        return self.total / self.n
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1)."""
+        if self.n < 2:
+            return 0.0
+        return float(np.sqrt(max(self.total_sq - self.total ** 2 / self.n, 0) / (self.n - 1)))
+
+
+class FixedHistogram:
+    """Counts per zero-aligned bin of ``width``; bins are kept sparse."""
+
+    def __init__(self, width=1, counts=None):
+        self.width = width
+        self.counts = pd.Series(dtype="int64") if counts is None else counts
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        bins = np.floor(values / self.width).astype(np.int64)
+        low = bins.min()
+        counts = np.bincount(bins - low)
+        occupied = np.flatnonzero(counts)
+        return self.merge(FixedHistogram(self.width, pd.Series(counts[occupied], index=occupied + low)))
+
+    def merge(self, other):
+        self.counts = self.counts.add(other.counts, fill_value=0).astype("int64").sort_index()
+        return self
+
+    def bins(self):
+        """Left edges and counts of the occupied bins, in ascending order."""
+        return self.counts.index.to_numpy() * self.width, self.counts.to_numpy()
+
+
+class ColumnSketches:
+    """A ``KLLSketch`` and a ``FixedHistogram`` per numeric column.
+
+    Kept for the whole column (group ``None``) and for every level of ``by``.
+    Each sketch, in every chunk, is seeded with its own child of the
+    ``seed`` sequence.
+    """
+
+    def __init__(self, columns=SKETCH_COLUMNS, by="Product", k=None, seed=None):
+        self.columns = tuple(columns)
+        self.by = by
+        self.k = k or k_for_error(SKETCH_ERROR)
+        self.sketches = {}
+        self.histograms = {}
+        self._seeds = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+    def _add(self, column, group, values):
+        key = (column, group)
+        if key not in self.sketches:
+            self.sketches[key] = KLLSketch(self.k, seed=self._seeds.spawn(1)[0])
+            self.histograms[key] = FixedHistogram(HISTOGRAM_WIDTHS.get(column, 1))
+        self.sketches[key].update(values)
+        self.histograms[key].update(values)
+
+    @classmethod
+    def from_frame(cls, df, columns=SKETCH_COLUMNS, by="Product", k=None, seed=None):
+        sketches = cls(columns, by, k, seed)
+        for column in sketches.columns:
+            sketches._add(column, None, df[column].to_numpy())
+        for group, part in df.groupby(by, observed=True)[list(sketches.columns)]:
+            for column in sketches.columns:
+                sketches._add(column, group, part[column].to_numpy())
+        return sketches
+
+    def merge(self, other):
+        for key, sketch in other.sketches.items():
+            if key in self.sketches:
+                self.sketches[key].merge(sketch)
+                self.histograms[key].merge(other.histograms[key])
+            else:
+                self.sketches[key] = sketch
+                self.histograms[key] = other.histograms[key]
+        return self
+
+    def update(self, chunk):
+        return self.merge(ColumnSketches.from_frame(chunk, self.columns, self.by, self.k, self._seeds.spawn(1)[0]))
+
+    @property
+    def groups(self):
+        return sorted({group for _, group in self.sketches if group is not None})
+
+    def sketch(self, column, group=None):
+        return self.sketches[(column, group)]
+
+    def quantile(self, column, q, group=None):
+        return self.sketch(column, group).quantile(q)
+
+    def histogram(self, column, group=None):
+        return self.histograms[(column, group)]
@@ -0,0 +1,16 @@
+import numpy as np
+
+import aggregates
+import data_loader
+
+
+def test_cube_std_does_not_cancel_on_large_offsets():
+    df = data_loader.load_dataset(data_loader.DATA_FILE, use_cache=False)
+    shifted = df.assign(Income=df["Income"] + 1e9)
+    cube = aggregates.AggregateCube()
+    for start in range(0, len(shifted), 50):
+        cube.update(shifted.iloc[start:start + 50])
+
+    assert np.isclose(cube.std("Income"), df["Income"].std(), rtol=1e-9)
+    expected = df.groupby("Product", observed=True)["Income"].std()
+    assert np.allclose(cube.std("Income", by="Product"), expected, rtol=1e-9)
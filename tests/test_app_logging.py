@@ -0,0 +1,16 @@
+import json
+
+import app_logging
+
+
+def test_search_matches_word_prefixes_and_falls_back_to_substrings(tmp_path):
+    path = tmp_path / "app.log"
+    messages = [("INFO", "Building explorer filter indexes"), ("ERROR", "load -> failed"), ("INFO", "Data ready")]
+    path.write_text("".join(json.dumps({"level": level, "message": message}) + "\n" for level, message in messages))
+    index = app_logging.LogIndex(str(path))
+    index.refresh()
+
+    assert list(index.search(text="buil FILT")) == [0]
+    assert list(index.search(text="->")) == [1]
+    assert list(index.search(level="INFO", text="->")) == []
+    assert list(index.search(level="INFO", text=" ")) == [0, 2]
@@ -0,0 +1,21 @@
+import base64
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import charts
+
+
+def _decoded(value):
+    return np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"]).reshape(
+        [int(n) for n in value["shape"].split(",")])
+
+
+def test_compacting_keeps_text_values_as_written():
+    corr = np.array([[1.0, 0.28], [0.28, 1.0]] * 10)
+    fig = go.Figure(go.Heatmap(z=corr, text=corr.round(2), texttemplate="%{text}"))
+    trace = json.loads(pio.to_json(charts.compact_arrays(fig)))["data"][0]
+    assert [str(value) for value in _decoded(trace["text"])[0].tolist()] == ["1.0", "0.28"]
+    assert trace["z"]["dtype"] == "f4"  # the plotted values are still narrowed
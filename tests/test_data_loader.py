@@ -0,0 +1,19 @@
+import pytest
+
+import data_loader
+
+
+def test_shared_frame_derives_columns_once_without_changing():
+    df = data_loader.share(data_loader.load_dataset(data_loader.DATA_FILE, use_cache=False))
+    assert data_loader.derived_memory(df)["Income_band"] is None
+
+    first = data_loader.ensure_columns(df, ["Income_band"])
+    second = data_loader.ensure_columns(df, ["Income_band"])
+    assert "Income_band" not in df.columns
+    assert data_loader.derived_memory(df)["Income_band"] is not None
+    assert first["Income_band"].array.codes.base is second["Income_band"].array.codes.base
+
+    first.loc[0, "Income_band"] = first["Income_band"].cat.categories[-1]
+    assert second["Income_band"].iloc[0] != first["Income_band"].iloc[0]
+    with pytest.raises(data_loader.SharedFrameError):
+        df["Income_band"] = first["Income_band"]
@@ -0,0 +1,71 @@
+import shutil
+
+import pytest
+
+import data_loader
+import dataset
+
+
+@pytest.fixture
+def export(tmp_path):
+    """A copy of the bundled export's header and first 12 rows, and those 13 lines."""
+    with open(data_loader.DATA_FILE, "rb") as f:
+        lines = f.read().splitlines(keepends=True)[:13]
+    path = tmp_path / "export.csv"
+    path.write_bytes(b"".join(lines))
+    return str(path), lines
+
+
+@pytest.mark.parametrize("cut", [2, 20], ids=["last-field", "missing-fields"])
+def test_partial_last_line_is_loaded_once_completed(export, cut):
+    path, lines = export
+    complete, last = b"".join(lines[:-1]), lines[-1]
+    with open(path, "wb") as f:
+        f.write(complete + last[:-cut])
+
+    live = dataset.AppendableDataset(path, use_snapshot=False)
+    df, summary, _, _ = live.current()
+    assert len(df) == summary.n_rows == 11
+
+    with open(path, "ab") as f:
+        f.write(last[-cut:])
+    df, summary, _, _ = live.current()
+    assert len(df) == summary.n_rows == 12
+    expected = data_loader.read_csv_typed(path)
+    assert df["Miles"].tolist() == expected["Miles"].tolist()
+
+
+def test_rebuild_with_partial_line_uses_no_stale_sidecar(export, tmp_path):
+    path, lines = export
+    data_loader.load_dataset(path)
+    with open(path, "ab") as f:
+        f.write(lines[-1][:10])
+    assert len(data_loader.load_dataset(path)) == 12
+    shutil.rmtree(tmp_path / data_loader.CACHE_DIR)
+    assert len(data_loader.load_dataset(path, use_cache=False)) == 12
+
+
+def test_malformed_appended_rows_are_skipped(export):
+    path, lines = export
+    with open(path, "wb") as f:
+        f.write(b"".join(lines[:-1]))
+    live = dataset.AppendableDataset(path, use_snapshot=False)
+    live.current()
+
+    with open(path, "ab") as f:
+        f.write(b"KP999,30,Male,16,Single,3,3,50000,100\n" + b"KP281,30,Male\n" + lines[-1])
+    df, summary, _, _ = live.current()
+    assert len(df) == summary.n_rows == 12
+    assert set(df["Product"]) <= set(data_loader.PRODUCT_PRICES)
+
+
+def test_sidecar_that_cannot_be_mapped_falls_back_to_the_parse(export, tmp_path, monkeypatch):
+    path, _ = export
+
+    def replaced_meanwhile(sidecar):
+        raise data_loader.pa.ArrowInvalid("File is too small: 0")
+
+    monkeypatch.setattr(data_loader, "map_sidecar", replaced_meanwhile)
+    assert len(data_loader.load_dataset(path)) == 12
+    assert len(data_loader.load_dataset(path)) == 12
+    assert not list((tmp_path / data_loader.CACHE_DIR).glob("*.tmp"))
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+import indexes
+
+
+@pytest.fixture(scope="module")
+def df():
+    return data_loader.load_dataset(data_loader.DATA_FILE, use_cache=False)
+
+
+@pytest.fixture(scope="module")
+def index(df):
+    return indexes.FilterIndex(df)
+
+
+def mask_positions(df, levels, ranges):
+    mask = pd.Series(True, index=df.index)
+    for column, selected in levels.items():
+        mask &= df[column].isin(selected)
+    for column, (low, high) in ranges.items():
+        mask &= df[column].between(low, high)
+    return np.flatnonzero(mask.to_numpy())
+
+
+@pytest.mark.parametrize("levels, ranges", [
+    ({}, {}),
+    ({"Product": ["KP281", "KP481", "KP781"]}, {"Age": (18, 50)}),
+    ({"Product": ["KP781"], "Gender": ["Female"]}, {}),
+    ({"MaritalStatus": ["Single"], "Fitness": [3, 4]}, {"Income": (40_000, 70_000), "Usage": (3, 5)}),
+    ({"Product": []}, {}),
+    ({}, {"Age": (200, 300)}),
+])
+def test_select_matches_boolean_mask(df, index, levels, ranges):
+    expected = mask_positions(df, levels, ranges)
+    assert np.array_equal(index.select(levels, ranges), expected)
+
+
+@pytest.mark.parametrize("column", ["Age", "Income", "Product", "Fitness", "Miles"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("filtered", [False, True])
+def test_order_by_and_paging_match_sort_values(df, index, column, descending, filtered):
+    levels = {"Gender": ["Male"]} if filtered else {}
+    positions = index.select(levels, {})
+    keys = indexes.sort_keys(data_loader.derived(df, column))
+
+    ordered = index.order_by(positions, keys, column, descending)
+    expected = df.iloc[positions].sort_values(column, ascending=not descending, kind="stable")
+    assert np.array_equal(df.index[ordered], expected.index)
+
+    page_size = 25
+    n_pages = -(-len(ordered) // page_size)
+    for page in (1, 2, n_pages):
+        start, stop = indexes.page_slice(len(ordered), page, page_size)
+        rows = expected.iloc[(page - 1) * page_size:page * page_size]
+        assert np.array_equal(df.index[ordered[start:stop]], rows.index)
+
+
+def test_order_by_empty_selection(df, index):
+    positions = index.select({"Product": []}, {})
+    for column in ("Age", "Product"):
+        ordered = index.order_by(positions, indexes.sort_keys(df[column]), column, descending=True)
+        assert len(ordered) == 0
+    assert indexes.page_slice(0, 1, 50) == (0, 0)
+
+
+def test_page_slice_clamps_the_last_partial_page():
+    assert indexes.page_slice(120, 1, 50) == (0, 50)
+    assert indexes.page_slice(120, 3, 50) == (100, 120)
+    assert indexes.page_slice(120, 4, 50) == (120, 120)
+    assert indexes.page_slice(100, 2, 50) == (50, 100)
@@ -0,0 +1,30 @@
+import aggregates
+import data_loader
+import distributions
+import kpis
+
+
+def test_kpis_without_dimensions_evaluate_alone():
+    df = data_loader.load_dataset(data_loader.DATA_FILE, use_cache=False)
+    summary = aggregates.StreamingSummary().update(df)
+    values = kpis.evaluate(summary, kpis=["miles_range", "outliers"])
+    assert list(values["miles_range"].index) == sorted(data_loader.PRODUCT_PRICES)
+    assert values["outliers"]["Miles"][1] == (df["Miles"] > values["outliers"]["Miles"][0]).sum()
+
+
+def test_in_memory_fences_match_the_box_plot_quartiles():
+    df = data_loader.load_dataset(data_loader.DATA_FILE, use_cache=False)
+    summary = aggregates.StreamingSummary().update(df)
+    values = kpis.evaluate(summary, kpis=["miles_range", "outliers"], df=df)
+
+    overall = distributions.distribution_stats(df, by=None)
+    for column in kpis.OUTLIER_COLUMNS:
+        q1, q3 = overall.loc[(column, distributions.OVERALL), ["q1", "q3"]]
+        fence, count = values["outliers"][column]
+        assert fence == q3 + 1.5 * (q3 - q1)
+        assert count == (df[column] > fence).sum()
+    assert values["outliers"]["Miles"][0] == 187.875
+
+    by_product = distributions.distribution_stats(df, features=["Miles"])
+    assert values["miles_range"][0.25].tolist() == by_product["q1"].tolist()
+    assert values["miles_range"][0.75].tolist() == by_product["q3"].tolist()
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+import aggregates
+import data_loader
+import parallel
+
+
+def test_parallel_summary_matches_serial():
+    df = data_loader.load_dataset(data_loader.DATA_FILE, use_cache=False)
+    serial = aggregates.summarize_frame(df)
+    partitioned = parallel.summarize(df, workers=2, min_rows=0)
+
+    dimensions = list(aggregates.CUBE_DIMENSIONS)
+    labels = {dimension: object for dimension in dimensions}
+    expected = serial.cube.table.astype(labels).sort_values(dimensions, ignore_index=True)
+    actual = partitioned.cube.table.astype(labels).sort_values(dimensions, ignore_index=True)
+    pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-9)
+
+    assert partitioned.covariance.n == serial.covariance.n == len(df)
+    assert np.allclose(partitioned.covariance.means, serial.covariance.means)
+    assert np.allclose(partitioned.covariance.comoments, serial.covariance.comoments)
+    assert partitioned.n_rows == serial.n_rows
+    pd.testing.assert_series_equal(partitioned.cube.counts("Product"), serial.cube.counts("Product"))
+    assert partitioned.sketches.sketch("Income").n == len(df)
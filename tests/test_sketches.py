@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import sketches
+
+QUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def _rank_error(sketch, values):
+    """Largest gap, in rank, between the sketch's quantiles and np.quantile's."""
+    ordered = np.sort(values)
+    estimated = np.searchsorted(ordered, sketch.quantile(QUANTILES), side="right") / len(ordered)
+    exact = np.searchsorted(ordered, np.quantile(values, QUANTILES, method="inverted_cdf"), side="right") / len(ordered)
+    return np.abs(estimated - exact).max()
+
+
+@pytest.mark.parametrize("epsilon", [0.01, 0.05])
+def test_rank_error_stays_within_the_configured_bound(epsilon):
+    values = np.random.default_rng(7).lognormal(size=5000)
+    sketch = sketches.KLLSketch(sketches.k_for_error(epsilon), seed=1)
+    for chunk in np.array_split(values, 10):
+        sketch.update(chunk)
+    assert sum(len(level) for level in sketch.levels) < len(values)
+    assert _rank_error(sketch, values) <= epsilon
+
+
+def test_merged_halves_stay_within_the_bound():
+    values = np.random.default_rng(11).normal(size=6000)
+    seeds = np.random.SeedSequence(3).spawn(2)
+    left, right = (sketches.KLLSketch(sketches.k_for_error(0.01), seed=seed) for seed in seeds)
+    left.update(values[:3000])
+    right.update(values[3000:])
+    merged = left.merge(right)
+    assert merged.n == len(values)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+    assert _rank_error(merged, values) <= 0.01
+
+
+def test_column_sketches_seed_each_sketch_separately():
+    columns = sketches.ColumnSketches(columns=("a", "b"), by="g", seed=0)
+    columns._add("a", None, np.arange(10.0))
+    columns._add("b", None, np.arange(10.0))
+    draws = {column: columns.sketch(column)._rng.integers(1 << 30) for column in ("a", "b")}
+    assert draws["a"] != draws["b"]